@@ -3,35 +3,64 @@ import os
 import sys
 import datetime
 import re
-import questionary
-from .fetchers.arxiv import ArxivFetcher
-from .fetchers.ieee import IeeeFetcher
-from .fetchers.threegpp import ThreeGPPFetcher
 from .utils import save_papers_to_json, load_papers_from_json
+from .downloader import DownloadEngine, DownloadTask, DownloadResult
 from .config import load_config
-from .config_wizard import run_wizard
+from .sources import available_sources, create_fetcher, get_fetcher_class
+
+# questionary, the fetcher modules (arxiv, requests, bs4), the download index
+# (sqlite3) and the config wizard are imported where they are used, so `--help`
+# and scripted runs start quickly.
+
+# Streamed search results are printed in groups of this size, so the download
+# index is queried once per group rather than once per paper
+LOOKUP_BATCH = 25
 
 
 def get_default_output_dir(query: str, source: str) -> str:
     """Generate default output directory based on date and query."""
     date_str = datetime.datetime.now().strftime("%Y%m%d")
 
-    # Use fetcher to get safe directory name
-    if source == "arxiv":
-        safe_query = ArxivFetcher().get_query_dirname(query)
-    elif source == "ieee":
-        safe_query = IeeeFetcher().get_query_dirname(query)
-    elif source == "3gpp":
-        safe_query = ThreeGPPFetcher().get_query_dirname(query)
-    else:
+    # Use the fetcher class to get safe directory name (no instance needed)
+    try:
+        safe_query = get_fetcher_class(source).get_query_dirname(query)
+    except ValueError:
         # Fallback
         safe_query = re.sub(r"[^\w\-_]", "_", query)[:50]
 
     return os.path.join("downloads", f"{date_str}_{safe_query}")
 
 
+def print_paper(number: int, paper, downloaded: bool = False):
+    """Print a numbered search result."""
+    status = "[Downloadable]" if paper.is_downloadable else "[Restricted?]"
+    if downloaded:
+        status += " [Downloaded]"
+    print(f"[{number}] {status} {paper.title}")
+    print(
+        f"    Authors: {', '.join(paper.authors[:3])}{'...' if len(paper.authors) > 3 else ''}"
+    )
+    print(
+        f"    Year: {paper.published_date.year if paper.published_date else 'Unknown'}"
+    )
+    print(f"    URL: {paper.url}")
+    print("-" * 40)
+
+
+def print_download_result(result: DownloadResult):
+    """Print the outcome of a single download as it completes."""
+    if result.ok:
+        print(f"  -> [{result.paper.source}] Saved to: {result.path}")
+    else:
+        print(
+            f"  -> [{result.paper.source}] Failed: {result.paper.title}: {result.error}"
+        )
+
+
 def interactive_mode(loaded_config=None):
     """Run the CLI in interactive mode using questionary."""
+    import questionary
+
     if loaded_config is None:
         loaded_config = load_config()
 
@@ -40,7 +69,7 @@ def interactive_mode(loaded_config=None):
     # 1. Source Selection
     default_source = loaded_config.get("core", {}).get("default_source", "arxiv")
     source = questionary.select(
-        "Select source:", choices=["arxiv", "ieee", "3gpp"], default=default_source
+        "Select source:", choices=available_sources(), default=default_source
     ).ask()
 
     if not source:
@@ -100,12 +129,7 @@ def interactive_mode(loaded_config=None):
     # Helper to get hit count
     def check_hits(current_query):
         print(f"Checking potential hits for '{current_query}'...")
-        if source == "arxiv":
-            temp_client = ArxivFetcher()
-        elif source == "ieee":
-            temp_client = IeeeFetcher()
-        elif source == "3gpp":
-            temp_client = ThreeGPPFetcher()
+        temp_client = create_fetcher(source)
 
         try:
             if source == "ieee":
@@ -294,12 +318,7 @@ def interactive_mode(loaded_config=None):
 
     # 4. Search Execution
     print(f"\nSearching {source} for '{query}'...")
-    if source == "arxiv":
-        client = ArxivFetcher()
-    elif source == "ieee":
-        client = IeeeFetcher()
-    elif source == "3gpp":
-        client = ThreeGPPFetcher()
+    client = create_fetcher(source)
 
     try:
         # Construct args for search
@@ -309,28 +328,34 @@ def interactive_mode(loaded_config=None):
             "sort_order": settings["sort_order"],
             "start_year": settings["start_year"],
             "end_year": settings["end_year"],
+            # None means unlimited; every fetcher pages through all results
+            "max_results": settings["search_limit"],
         }
-        if settings["search_limit"] is not None:
-            search_args["max_results"] = settings["search_limit"]
 
         if source == "ieee":
             search_args["open_access_only"] = settings["open_access_only"]
 
-        results = client.search(**search_args)
+        results = []
+        fetched_count = 0
+        for paper in client.iter_search(**search_args):
+            fetched_count += 1
+            # Filter if requested
+            if settings["downloadable_only"] and not paper.is_downloadable:
+                continue
+            results.append(paper)
+            print(f"\r  Fetched {fetched_count} papers...", end="", flush=True)
+        print()
     except Exception as e:
         print(f"Error during search: {e}")
         return
 
-    if not results:
+    if not fetched_count:
         print("No results found.")
         return
 
-    # Filter if requested
-    if settings["downloadable_only"]:
-        results = [p for p in results if p.is_downloadable]
-        if not results:
-            print("No downloadable results found.")
-            return
+    if not results:
+        print("No downloadable results found.")
+        return
 
     # 5. Action Selection (Download or Export)
     action = questionary.select(
@@ -363,9 +388,15 @@ def interactive_mode(loaded_config=None):
 
     # --- Download Flow ---
     # 6. Select Papers
+    from .library import get_library
+
+    library = get_library()
+    downloaded = library.lookup_papers(results) if library else {}
     choices = []
     for p in results:
         status = "[DL]" if p.is_downloadable else "[--]"
+        if (p.source, p.id) in downloaded:
+            status += "[✓]"
         # Limit title length for display
         title_display = (p.title[:60] + "..") if len(p.title) > 60 else p.title
         label = f"{status} {title_display} ({p.published_date.year if p.published_date else '?'})"
@@ -408,34 +439,26 @@ def interactive_mode(loaded_config=None):
 
     print(f"\nDownloading {len(selected_papers)} papers to '{final_output_dir}'...")
 
-    for paper in selected_papers:
-        print(f"Downloading: {paper.title}...")
-        try:
-            if source == "3gpp":
-                path = client.download_pdf(
-                    paper,
-                    final_output_dir,
-                    convert_to_md=settings.get("convert_to_md", False),
-                    convert_to_pdf=settings.get("convert_to_pdf", True),
-                )
-            else:
-                path = client.download_pdf(
-                    paper,
-                    final_output_dir,
-                    convert_to_md=settings.get("convert_to_md", False),
-                )
-            print(f"  -> Saved to: {path}")
-        except Exception as e:
-            print(f"  -> Failed: {e}")
+    options = {"convert_to_md": settings.get("convert_to_md", False)}
+    if source == "3gpp":
+        options["convert_to_pdf"] = settings.get("convert_to_pdf", True)
+
+    tasks = [
+        DownloadTask(client, paper, final_output_dir, options)
+        for paper in selected_papers
+    ]
+    engine = DownloadEngine(core_config.get("download_jobs", 1))
+    results = engine.run(tasks, on_result=print_download_result)
 
-    print("\nDone.")
+    success_count = sum(1 for r in results if r.ok)
+    print(f"\nDone. Downloaded {success_count}/{len(results)} papers.")
 
 
 def main():
     parser = argparse.ArgumentParser(description="PaperFetch CLI")
     parser.add_argument(
         "--source",
-        choices=["arxiv", "ieee", "3gpp"],
+        choices=available_sources(),
         required=False,
         help="Source to fetch from",
     )
@@ -487,6 +510,11 @@ def main():
     parser.add_argument("--start-year", type=int, help="Filter by start year")
     parser.add_argument("--end-year", type=int, help="Filter by end year")
     parser.add_argument("--export", help="Export search results to a JSON file")
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file for large arXiv harvests. An interrupted search resumes "
+        "from the saved offset and returns only the remaining results (arXiv only)",
+    )
     parser.add_argument("--from-file", help="Download papers from a JSON file")
     parser.add_argument(
         "--convert-to-md",
@@ -496,11 +524,23 @@ def main():
     parser.add_argument(
         "--no-pdf", action="store_true", help="Skip PDF conversion (3GPP only)"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of parallel download workers (default: config or 1). "
+        "Downloads from the same host are still run one at a time.",
+    )
     parser.add_argument(
         "--init-config",
         action="store_true",
         help="Run interactive wizard to generate config.toml",
     )
+    parser.add_argument(
+        "--prune-library",
+        action="store_true",
+        help="Remove download index entries whose files no longer exist",
+    )
 
     # Check if any args are passed. If not, go interactive.
     if len(sys.argv) == 1:
@@ -510,9 +550,21 @@ def main():
     args = parser.parse_args()
 
     if args.init_config:
+        from .config_wizard import run_wizard
+
         run_wizard()
         return
 
+    if args.prune_library:
+        from .library import get_library
+
+        library = get_library()
+        if library is None:
+            print("The download index is disabled ([library] enabled = false).")
+        else:
+            print(f"Removed {library.prune_missing()} missing files from the index.")
+        return
+
     # Load Config
     config = load_config()
     core_cfg = config.get("core", {})
@@ -536,6 +588,10 @@ def main():
         if args.search_limit == 0:
             args.search_limit = None
 
+    # jobs
+    if args.jobs is None:
+        args.jobs = core_cfg.get("download_jobs", 1)
+
     # download_limit
     if args.download_limit is None:
         args.download_limit = core_cfg.get("download_limit", None)
@@ -580,62 +636,47 @@ def main():
             # Default to a generic downloads folder if not specified
             base_output_dir = "downloads/from_file"
 
-        # We need a client to download. Since papers can be mixed source, we need to instantiate appropriate fetchers.
-        arxiv_client = ArxivFetcher()
-        ieee_client = IeeeFetcher()
-        threegpp_client = ThreeGPPFetcher()
-
-        print(f"Downloading to '{base_output_dir}'...")
+        # We need a client to download. Since papers can be mixed source, we build
+        # one fetcher per source on first use.
+        clients = {}
 
-        count = 0
+        tasks = []
         for paper in papers:
-            # Apply download limit if set
-            if args.download_limit is not None and count >= args.download_limit:
-                print(f"Download limit ({args.download_limit}) reached.")
-                break
+            if paper.source not in clients:
+                try:
+                    clients[paper.source] = create_fetcher(paper.source)
+                except ValueError:
+                    clients[paper.source] = None
+            client = clients[paper.source]
+            if client is None:
+                print(f"Skipping '{paper.title}': Unknown source: {paper.source}")
+                continue
+
+            final_dir = (
+                os.path.join(base_output_dir, paper.source)
+                if not args.no_source_subdir
+                else base_output_dir
+            )
+            options = {"convert_to_md": args.convert_to_md}
+            if paper.source == "3gpp":
+                options["convert_to_pdf"] = not args.no_pdf
+            tasks.append(DownloadTask(client, paper, final_dir, options))
 
-            print(f"Downloading: {paper.title} ({paper.source})...")
-            try:
-                if paper.source == "arxiv":
-                    final_dir = (
-                        os.path.join(base_output_dir, "arxiv")
-                        if not args.no_source_subdir
-                        else base_output_dir
-                    )
-                    path = arxiv_client.download_pdf(
-                        paper, final_dir, convert_to_md=args.convert_to_md
-                    )
-                elif paper.source == "ieee":
-                    final_dir = (
-                        os.path.join(base_output_dir, "ieee")
-                        if not args.no_source_subdir
-                        else base_output_dir
-                    )
-                    path = ieee_client.download_pdf(
-                        paper, final_dir, convert_to_md=args.convert_to_md
-                    )
-                elif paper.source == "3gpp":
-                    final_dir = (
-                        os.path.join(base_output_dir, "3gpp")
-                        if not args.no_source_subdir
-                        else base_output_dir
-                    )
-                    path = threegpp_client.download_pdf(
-                        paper,
-                        final_dir,
-                        convert_to_md=args.convert_to_md,
-                        convert_to_pdf=not args.no_pdf,
-                    )
-                else:
-                    print(f"  -> Unknown source: {paper.source}")
-                    continue
+        # Apply download limit if set
+        if args.download_limit is not None and len(tasks) > args.download_limit:
+            print(f"Download limit ({args.download_limit}) applied.")
+            tasks = tasks[: args.download_limit]
 
-                print(f"  -> Saved to: {path}")
-                count += 1
-            except Exception as e:
-                print(f"  -> Failed: {e}")
+        print(
+            f"Downloading {len(tasks)} papers to '{base_output_dir}' "
+            f"({args.jobs} parallel workers)..."
+        )
+
+        engine = DownloadEngine(args.jobs)
+        results = engine.run(tasks, on_result=print_download_result)
 
-        print("\nDone.")
+        success_count = sum(1 for r in results if r.ok)
+        print(f"\nDone. Downloaded {success_count}/{len(results)} papers.")
         return
 
     # --- Mode: Search (and optionally Export/Download) ---
@@ -650,13 +691,7 @@ def main():
 
     print(f"Searching {args.source} for '{args.query}'...")
 
-    client = None
-    if args.source == "arxiv":
-        client = ArxivFetcher()
-    elif args.source == "ieee":
-        client = IeeeFetcher()
-    elif args.source == "3gpp":
-        client = ThreeGPPFetcher()
+    client = create_fetcher(args.source)
 
     # Handle 0 as unlimited
     search_limit_val = args.search_limit
@@ -664,54 +699,61 @@ def main():
         print("Warning: Unlimited search selected. This may trigger rate limits.")
         search_limit_val = None
 
+    search_args = {
+        "max_results": search_limit_val,
+        "sort_by": args.sort_by,
+        "sort_order": args.sort_order,
+        "start_year": args.start_year,
+        "end_year": args.end_year,
+    }
+    # Pass open_access_only to search if supported (IEEE)
+    if args.source == "ieee":
+        search_args["open_access_only"] = args.open_access_only
+    elif args.source == "arxiv":
+        search_args["checkpoint"] = args.checkpoint
+
+    # Results are printed as they stream in (page by page)
+    from .library import get_library
+
+    library = get_library()
+    results = []
+    printed = 0
+    fetched_count = 0
+
+    def print_pending():
+        nonlocal printed
+        pending = results[printed:]
+        downloaded = library.lookup_papers(pending) if library and pending else {}
+        for paper in pending:
+            printed += 1
+            print_paper(printed, paper, (paper.source, paper.id) in downloaded)
+
+    print()
     try:
-        # Pass open_access_only to search if supported (IEEE)
-        if args.source == "ieee":
-            results = client.search(
-                args.query,
-                max_results=search_limit_val,
-                open_access_only=args.open_access_only,
-                sort_by=args.sort_by,
-                sort_order=args.sort_order,
-                start_year=args.start_year,
-                end_year=args.end_year,
-            )
-        else:
-            results = client.search(
-                args.query,
-                max_results=search_limit_val,
-                sort_by=args.sort_by,
-                sort_order=args.sort_order,
-                start_year=args.start_year,
-                end_year=args.end_year,
-            )
+        for paper in client.iter_search(args.query, **search_args):
+            fetched_count += 1
+            # Filter if requested (Client-side filter)
+            if args.downloadable_only and not paper.is_downloadable:
+                continue
+            results.append(paper)
+            if len(results) - printed >= LOOKUP_BATCH:
+                print_pending()
     except Exception as e:
+        print_pending()
         print(f"Error during search: {e}")
+        if not results:
+            return
+    print_pending()
+
+    if not fetched_count:
+        print("No results found.")
         return
 
     if not results:
-        print("No results found.")
+        print("No downloadable results found in the search results.")
         return
 
-    # Filter if requested (Client-side filter)
-    if args.downloadable_only:
-        results = [p for p in results if p.is_downloadable]
-        if not results:
-            print("No downloadable results found in the search results.")
-            return
-
-    print(f"\nFound {len(results)} papers:")
-    for i, paper in enumerate(results):
-        status = "[Downloadable]" if paper.is_downloadable else "[Restricted?]"
-        print(f"[{i+1}] {status} {paper.title}")
-        print(
-            f"    Authors: {', '.join(paper.authors[:3])}{'...' if len(paper.authors) > 3 else ''}"
-        )
-        print(
-            f"    Year: {paper.published_date.year if paper.published_date else 'Unknown'}"
-        )
-        print(f"    URL: {paper.url}")
-        print("-" * 40)
+    print(f"\nFound {len(results)} papers.")
 
     # --- Export Mode ---
     if args.export:
@@ -770,26 +812,19 @@ def main():
 
     print(f"\nDownloading {len(selected_indices)} papers to '{final_output_dir}'...")
 
-    for idx in selected_indices:
-        paper = results[idx]
-        print(f"Downloading: {paper.title}...")
-        try:
-            if args.source == "3gpp":
-                path = client.download_pdf(
-                    paper,
-                    final_output_dir,
-                    convert_to_md=args.convert_to_md,
-                    convert_to_pdf=not args.no_pdf,
-                )
-            else:
-                path = client.download_pdf(
-                    paper, final_output_dir, convert_to_md=args.convert_to_md
-                )
-            print(f"  -> Saved to: {path}")
-        except Exception as e:
-            print(f"  -> Failed: {e}")
+    options = {"convert_to_md": args.convert_to_md}
+    if args.source == "3gpp":
+        options["convert_to_pdf"] = not args.no_pdf
+
+    tasks = [
+        DownloadTask(client, results[idx], final_output_dir, options)
+        for idx in selected_indices
+    ]
+    engine = DownloadEngine(args.jobs)
+    download_results = engine.run(tasks, on_result=print_download_result)
 
-    print("\nDone.")
+    success_count = sum(1 for r in download_results if r.ok)
+    print(f"\nDone. Downloaded {success_count}/{len(download_results)} papers.")
 
 
 if __name__ == "__main__":
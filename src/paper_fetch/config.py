@@ -1,6 +1,9 @@
+import copy
 import os
+import threading
 import tomllib
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
 
 # Default Configuration
 DEFAULT_CONFIG = {
@@ -10,12 +13,44 @@ DEFAULT_CONFIG = {
         "download_limit": None,
         "output_dir": "downloads",
         "convert_to_md": False,
+        "download_jobs": 1,
     },
     "advanced": {
         "download_wait_min": 10.0,
         "download_wait_max": 40.0,
         "search_wait_min": 0.0,
         "search_wait_max": 2.0,
+        "search_burst": 1,
+        "download_burst": 1,
+    },
+    "http": {
+        "pool_connections": 4,
+        "pool_maxsize": 8,
+        "pool_block": False,
+        "keep_alive": True,
+        "max_retries": 2,
+        "retry_backoff": 0.5,
+        "download_retries": 3,
+    },
+    "cache": {
+        "enabled": True,
+        "dir": "~/.cache/paper-fetch/http",
+        "max_size_mb": 100,
+        "default_ttl": 3600,
+        "ttl": {
+            "3gpp": 600,
+        },
+    },
+    "library": {
+        "enabled": True,
+        "path": "~/.local/share/paper-fetch/library.db",
+    },
+    "gui": {
+        "page_size": 50,
+    },
+    "mcp": {
+        "max_concurrency": 8,
+        "source_concurrency": {},
     },
     "api_keys": {
         "uspto": "",
@@ -23,38 +58,88 @@ DEFAULT_CONFIG = {
     "3gpp": {
         "convert_to_pdf": True,
     },
+    "converter": {
+        "office_server": True,
+        "workers": 0,
+        "timeout": 60,
+        "batch_size": 16,
+        "cache": {
+            "enabled": True,
+            "dir": "~/.cache/paper-fetch/convert",
+            "max_size_mb": 2048,
+        },
+    },
 }
 
 
-def load_config() -> Dict[str, Any]:
+# Memoized result of load_config(), keyed by the (path, mtime, size) of the config files
+_cached_config: Optional[Tuple[Tuple, Mapping[str, Any]]] = None
+_lock = threading.Lock()
+
+
+def _config_paths():
+    return [
+        os.path.expanduser("~/.config/paper-fetch/config.toml"),
+        os.path.join(os.getcwd(), "config.toml"),
+    ]
+
+
+def _file_signature(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (path, None)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def config_signature() -> Tuple:
+    """(path, mtime, size) of the config files; changes whenever load_config() would re-read them."""
+    return tuple(_file_signature(path) for path in _config_paths())
+
+
+def load_config() -> Mapping[str, Any]:
     """
     Load configuration from config.toml.
     Order of precedence:
     1. Local config (`./config.toml`)
     2. User config (`~/.config/paper-fetch/config.toml`)
     3. Default config
+
+    The result is cached and read-only (nested mappings are MappingProxyType,
+    lists become tuples). The files are only re-parsed when one of them is
+    created, modified or removed, so calling this repeatedly costs two stat calls.
     """
-    config = DEFAULT_CONFIG.copy()
+    global _cached_config
 
-    # Define paths to check
-    paths = [
-        os.path.expanduser("~/.config/paper-fetch/config.toml"),
-        os.path.join(os.getcwd(), "config.toml"),
-    ]
+    signature = config_signature()
+
+    with _lock:
+        if _cached_config is not None and _cached_config[0] == signature:
+            return _cached_config[1]
+
+        config = copy.deepcopy(DEFAULT_CONFIG)
+
+        for path, *stat in signature:
+            if stat[0] is not None:
+                try:
+                    with open(path, "rb") as f:
+                        user_config = tomllib.load(f)
+                        _deep_merge(config, user_config)
+                except Exception as e:
+                    print(f"Warning: Failed to load config from {path}: {e}")
 
-    # loaded_something = False
+        frozen = _freeze(config)
+        _cached_config = (signature, frozen)
+        return frozen
 
-    for path in paths:
-        if os.path.exists(path):
-            try:
-                with open(path, "rb") as f:
-                    user_config = tomllib.load(f)
-                    _deep_merge(config, user_config)
-                    # loaded_something = True
-            except Exception as e:
-                print(f"Warning: Failed to load config from {path}: {e}")
 
-    return config
+def _freeze(value: Any) -> Any:
+    """Return a read-only view of nested dicts/lists."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
 
 
 def _deep_merge(base: Dict[str, Any], update: Dict[str, Any]):
@@ -0,0 +1,171 @@
+import math
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .converter import SOFFICE_BATCH_SIZE, Converter
+from .office import worker_count
+
+
+class ConversionPool:
+    """
+    Converts documents (Office -> PDF and/or Markdown) on a thread pool so
+    that downloads do not wait for LibreOffice. Each worker thread uses its
+    own soffice profile (see Converter.convert_to_pdf); with the office
+    server enabled, the workers feed its queue instead.
+
+    Requests wait in a pending list; a free worker takes up to `batch_size`
+    of them that share an output directory and converts them with one
+    Converter.convert_many_to_pdf call, so a backlog costs one soffice
+    start per batch rather than per document. A batch takes at most its
+    share of the backlog, so all workers get documents. With the office
+    server there is no startup to save and each worker takes one request.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        converter: Optional[Converter] = None,
+        batch_size: int = SOFFICE_BATCH_SIZE,
+    ):
+        self.converter = converter or Converter()
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self._pending: List[Tuple[str, Optional[str], Optional[str], Future]] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="convert"
+        )
+
+    def submit(
+        self,
+        input_path: str,
+        pdf_dir: Optional[str] = None,
+        md_dir: Optional[str] = None,
+    ) -> "Future[Optional[str]]":
+        """
+        Queue the conversion of one file. The future resolves to the generated
+        PDF path (None if no PDF was requested or the conversion failed).
+        """
+        future: Future = Future()
+        with self._lock:
+            self._pending.append((input_path, pdf_dir, md_dir, future))
+        # One drain per request; a drain may also serve requests queued after it
+        self._executor.submit(self._drain)
+        return future
+
+    def _take_batch(self):
+        # Batching only saves soffice starts; the office server is already warm
+        batch_size = 1 if self.converter.office_server is not None else self.batch_size
+        with self._lock:
+            if not self._pending:
+                return []
+            pdf_dir = self._pending[0][1]
+            batch = [r for r in self._pending if r[1] == pdf_dir]
+            batch = batch[: min(batch_size, math.ceil(len(batch) / self.workers))]
+            for request in batch:
+                self._pending.remove(request)
+        return batch
+
+    def _drain(self):
+        batch = [r for r in self._take_batch() if r[3].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        pdf_dir = batch[0][1]
+        pdf_paths: Dict[str, Optional[str]] = {}
+        try:
+            if pdf_dir:
+                pdf_paths = self.converter.convert_many_to_pdf(
+                    [r[0] for r in batch], pdf_dir, self.batch_size
+                )
+        except Exception as e:
+            for request in batch:
+                request[3].set_exception(e)
+            return
+
+        for input_path, _, md_dir, future in batch:
+            try:
+                if md_dir:
+                    self.converter.convert_to_markdown(input_path, md_dir)
+                future.set_result(pdf_paths.get(input_path))
+            except Exception as e:
+                future.set_exception(e)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+def when_all(futures: List[Future], callback: Callable[[List[Any]], Any]) -> Future:
+    """
+    Future for `callback(results)`, run once every future in `futures` is done.
+    Failed conversions count as None.
+    """
+    combined: Future = Future()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def finish():
+        results = [None if f.exception() else f.result() for f in futures]
+        try:
+            combined.set_result(callback(results))
+        except Exception as e:
+            combined.set_exception(e)
+
+    def on_done(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            finish()
+
+    if not futures:
+        finish()
+    for future in futures:
+        future.add_done_callback(on_done)
+    return combined
+
+
+# Set while a DownloadEngine runs a task: fetchers may then return a Future
+# for work that finishes after the download (see deferring()).
+_deferred = threading.local()
+
+
+@contextmanager
+def defer_conversions() -> Iterator[None]:
+    """Let download_pdf calls on this thread hand back conversions as futures."""
+    previous = getattr(_deferred, "active", False)
+    _deferred.active = True
+    try:
+        yield
+    finally:
+        _deferred.active = previous
+
+
+def deferring() -> bool:
+    """Whether the caller accepts a Future from download_pdf."""
+    return getattr(_deferred, "active", False)
+
+
+_pool: Optional[ConversionPool] = None
+_lock = threading.Lock()
+
+
+def get_conversion_pool(
+    converter_cfg: Optional[Mapping[str, Any]] = None,
+) -> ConversionPool:
+    """Return the process-wide conversion pool (sized by `[converter] workers`)."""
+    global _pool
+    if converter_cfg is None:
+        from .config import load_config
+
+        converter_cfg = load_config().get("converter", {})
+
+    with _lock:
+        if _pool is None:
+            _pool = ConversionPool(
+                worker_count(converter_cfg),
+                batch_size=converter_cfg.get("batch_size", SOFFICE_BATCH_SIZE),
+            )
+        return _pool
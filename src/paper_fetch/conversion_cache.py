@@ -0,0 +1,248 @@
+import hashlib
+import logging
+import os
+import re
+import shutil
+import threading
+import uuid
+from typing import Any, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when conversion options change so older artifacts are not reused
+CACHE_FORMAT = "1"
+
+# Placeholder for the media directory inside cached Markdown
+_MEDIA_TOKEN = "{{paper-fetch-media}}"
+_MEDIA_REF = re.compile(re.escape(_MEDIA_TOKEN) + r"/([^\s)\"'>\]]+)")
+
+
+def tool_id(executable: Optional[str]) -> str:
+    """
+    Identify the installed version of an external tool by its resolved path,
+    size and mtime (an upgrade replaces the binary), without running it.
+    """
+    if not executable:
+        return ""
+    path = os.path.realpath(shutil.which(executable) or executable)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return path
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """
+    Disk cache of conversion outputs keyed by content, so an identical document
+    (e.g. the same attachment re-shipped in another 3GPP ZIP) is not converted
+    twice.
+
+    The key is the SHA-256 of the input bytes, the output kind ("pdf" / "md")
+    and the identity of the tool that produced it. PDFs are stored as
+    `<key>.pdf`; Markdown as a `<key>.md` directory holding the document and
+    the media files it references. The directory is capped at `max_size`
+    bytes; the least recently used entries (by mtime, refreshed on every hit)
+    are evicted first.
+    """
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(input_path: str, kind: str, tool: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(file_digest(input_path).encode())
+        digest.update(f"\0{kind}\0{tool}\0{CACHE_FORMAT}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str, kind: str) -> str:
+        return os.path.join(self.directory, f"{key}.{kind}")
+
+    def get_pdf(self, key: str, dest_path: str) -> bool:
+        """
+        Copy the cached PDF to dest_path. Not a hard link: the user's file
+        must not share its mtime (used for eviction) or its edits (e.g. PDF
+        annotations saved in place) with the cache entry.
+        """
+        entry = self._path(key, "pdf")
+        try:
+            os.utime(entry)  # Mark as recently used
+            _copy_atomic(entry, dest_path)
+        except OSError:
+            return False
+        return True
+
+    def put_pdf(self, key: str, pdf_path: str):
+        tmp_path = self._tmp_path()
+        try:
+            shutil.copyfile(pdf_path, tmp_path)
+            os.replace(tmp_path, self._path(key, "pdf"))
+        except OSError:
+            _remove(tmp_path)
+            return
+        self._evict()
+
+    def get_markdown(self, key: str, dest_path: str, output_dir: str) -> bool:
+        """Restore cached Markdown (and its media files) into output_dir."""
+        entry = self._path(key, "md")
+        try:
+            with open(os.path.join(entry, "document.md"), "r", encoding="utf-8") as f:
+                text = f.read()
+            media_src = os.path.join(entry, "media")
+            if os.path.isdir(media_src):
+                shutil.copytree(
+                    media_src, os.path.join(output_dir, "media"), dirs_exist_ok=True
+                )
+            os.utime(entry)
+        except OSError:
+            return False
+
+        text = text.replace(_MEDIA_TOKEN, os.path.join(output_dir, "media"))
+        with open(dest_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return True
+
+    def put_markdown(self, key: str, md_path: str, output_dir: str):
+        """Store a Markdown result produced with --extract-media=output_dir."""
+        entry = self._path(key, "md")
+        if os.path.exists(entry):
+            return
+        tmp_dir = self._tmp_path()
+        try:
+            with open(md_path, "r", encoding="utf-8") as f:
+                text = f.read()
+            text = text.replace(os.path.join(output_dir, "media"), _MEDIA_TOKEN)
+
+            os.makedirs(tmp_dir)
+            for name in set(_MEDIA_REF.findall(text)):
+                # Keep the PNG made from WMF/EMF images as well
+                stem = os.path.splitext(name)[0]
+                for candidate in {name, stem + ".png"}:
+                    src = os.path.join(output_dir, "media", candidate)
+                    if os.path.isfile(src):
+                        dest = os.path.join(tmp_dir, "media", candidate)
+                        os.makedirs(os.path.dirname(dest), exist_ok=True)
+                        shutil.copyfile(src, dest)
+            with open(os.path.join(tmp_dir, "document.md"), "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_dir, entry)
+        except (OSError, UnicodeDecodeError):
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        self._evict()
+
+    def _tmp_path(self) -> str:
+        return os.path.join(self.directory, f".{uuid.uuid4().hex}.tmp")
+
+    def _evict(self):
+        """
+        Remove the least recently used entries above max_size. Other processes
+        (e.g. the CLI and the GUI) may share the directory and evict the same
+        entries concurrently, so vanished files are skipped, never raised.
+        """
+        with self._lock:
+            entries = []
+            total = 0
+            try:
+                with os.scandir(self.directory) as it:
+                    for entry in it:
+                        if entry.name.startswith("."):
+                            continue
+                        try:
+                            stat = entry.stat()
+                            size = stat.st_size
+                            if entry.is_dir():
+                                size = _tree_size(entry.path)
+                        except OSError:
+                            continue  # Evicted by another process
+                        total += size
+                        entries.append((stat.st_mtime, size, entry.path))
+            except OSError:
+                return
+
+            if total <= self.max_size:
+                return
+
+            for _, size, path in sorted(entries):
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    _remove(path)
+                total -= size
+                if total <= self.max_size:
+                    break
+
+
+def _tree_size(path: str) -> int:
+    size = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return size
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _copy_atomic(src: str, dest: str):
+    tmp_path = f"{dest}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dest)
+    except OSError:
+        _remove(tmp_path)
+        raise
+
+
+_cache: Optional[ConversionCache] = None
+_disabled = False  # Set when the cache directory could not be created
+_lock = threading.Lock()
+
+
+def get_conversion_cache(
+    cache_cfg: Optional[Mapping[str, Any]] = None,
+) -> Optional[ConversionCache]:
+    """
+    Return the process-wide conversion cache, or None if disabled in
+    [converter.cache] or its directory is not writable.
+    """
+    global _cache, _disabled
+    if _disabled:
+        return None
+    if cache_cfg is None:
+        from .config import load_config
+
+        cache_cfg = load_config().get("converter", {}).get("cache", {})
+    if not cache_cfg.get("enabled", True):
+        return None
+
+    with _lock:
+        if _cache is None:
+            try:
+                _cache = ConversionCache(
+                    cache_cfg.get("dir", "~/.cache/paper-fetch/convert"),
+                    int(float(cache_cfg.get("max_size_mb", 2048)) * 1024 * 1024),
+                )
+            except OSError as e:
+                logger.warning(f"Conversion cache disabled: {e}")
+                _disabled = True
+        return _cache
@@ -1,22 +1,210 @@
+import atexit
 import os
 import shutil
 import subprocess
+import tempfile
+import threading
+import time
 import zipfile
 import platform
 import logging
-from typing import Optional
+import signal
+from functools import cached_property
+from typing import Callable, Dict, List, Optional
+
+from .conversion_cache import get_conversion_cache, tool_id
+from .office import (
+    OfficeError,
+    OfficeUnavailable,
+    disable_office_server,
+    get_office_server,
+)
 
 logger = logging.getLogger(__name__)
 
+# Documents per soffice process, and the default timeout allowed for each of
+# them in seconds ([converter] timeout)
+SOFFICE_BATCH_SIZE = 16
+SOFFICE_TIMEOUT = 60
+
+# Limits applied when extracting ZIP archives (zip bomb protection)
+ZIP_MAX_MEMBERS = 10000
+ZIP_MAX_MEMBER_SIZE = 512 * 1024 * 1024
+ZIP_MAX_TOTAL_SIZE = 2 * 1024 * 1024 * 1024
+# Members larger than the threshold may expand at most ZIP_MAX_RATIO times
+ZIP_RATIO_THRESHOLD = 1024 * 1024
+ZIP_MAX_RATIO = 200
+
+# soffice profile directory of each thread (see _thread_profile_dir)
+_profiles = threading.local()
+
+
+def _pdf_path(input_path: str, output_dir: str) -> str:
+    """Where soffice --convert-to pdf writes the output for `input_path`."""
+    base_name = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir, f"{base_name}.pdf")
+
+
+def _run_soffice(cmd: List[str], timeout: float):
+    """
+    Run soffice like subprocess.run(check=True, capture_output=True). soffice
+    forks soffice.bin, so on timeout the whole process group is killed: an
+    orphaned soffice.bin would keep the thread's profile locked.
+    """
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+    )
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        else:
+            process.kill()
+        process.communicate()
+        raise
+    if process.returncode:
+        raise subprocess.CalledProcessError(
+            process.returncode, cmd, output=stdout, stderr=stderr
+        )
+
+
+def _soffice_batches(paths: List[str], batch_size: int) -> List[List[str]]:
+    """
+    Split `paths` into batches of at most `batch_size`. Files with the same
+    name stem go to different batches, since their PDFs would overwrite each other.
+    """
+    batches: List[List[str]] = []
+    stems: List[set] = []
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        for batch, batch_stems in zip(batches, stems):
+            if len(batch) < batch_size and stem not in batch_stems:
+                batch.append(path)
+                batch_stems.add(stem)
+                break
+        else:
+            batches.append([path])
+            stems.append({stem})
+    return batches
+
+
+class ZipLimitError(ValueError):
+    """The archive exceeds the extraction limits (possible zip bomb)."""
+
+
+def zip_member_name(info: zipfile.ZipInfo) -> str:
+    """
+    Decoded name of a ZIP member. zipfile decodes names without the UTF-8
+    flag as cp437, which garbles cp932 (Shift_JIS) names, so the raw bytes
+    are tried as UTF-8 and cp932 first.
+    """
+    if info.flag_bits & 0x800:
+        return info.filename
+    raw = info.filename.encode("cp437")
+    for encoding in ("utf-8", "cp932"):
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            pass
+    return info.filename
+
+
+def _check_zip_member(name: str, info: zipfile.ZipInfo):
+    if info.file_size > ZIP_MAX_MEMBER_SIZE:
+        raise ZipLimitError(f"{name} is {info.file_size} bytes")
+    if info.file_size > ZIP_RATIO_THRESHOLD and info.file_size > ZIP_MAX_RATIO * max(
+        info.compress_size, 1
+    ):
+        raise ZipLimitError(
+            f"{name} expands {info.file_size // max(info.compress_size, 1)}x"
+        )
+
+
+def _extract_zip_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo, dest_path: str):
+    """Write one member to dest_path through a .part file, in chunks."""
+    os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+    tmp_path = dest_path + ".part"
+    written = 0
+    try:
+        with zf.open(info) as src, open(tmp_path, "wb") as dst:
+            for block in iter(lambda: src.read(1024 * 1024), b""):
+                written += len(block)
+                # Do not trust the header: stop at the declared size
+                if written > info.file_size:
+                    raise ZipLimitError(f"{info.filename} is larger than declared")
+                dst.write(block)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _thread_profile_dir() -> str:
+    profile_dir = getattr(_profiles, "path", None)
+    if profile_dir is None:
+        profile_dir = tempfile.mkdtemp(prefix="paper-fetch-soffice-")
+        atexit.register(shutil.rmtree, profile_dir, True)
+        _profiles.path = profile_dir
+    return profile_dir
+
 
 class Converter:
     def __init__(self):
         self.os_type = platform.system()
-        self.has_unzip = shutil.which("unzip") is not None
-        self.has_pandoc = shutil.which("pandoc") is not None
-        self.has_soffice = self._find_soffice()
-        self.has_inkscape = shutil.which("inkscape") is not None
-        self.has_pdftotext = shutil.which("pdftotext") is not None
+
+    # External tools are probed on first use (and cached), not at construction
+
+    @cached_property
+    def has_pandoc(self) -> bool:
+        return shutil.which("pandoc") is not None
+
+    @cached_property
+    def has_soffice(self) -> Optional[str]:
+        return self._find_soffice()
+
+    @cached_property
+    def has_inkscape(self) -> bool:
+        return shutil.which("inkscape") is not None
+
+    @cached_property
+    def has_pdftotext(self) -> bool:
+        return shutil.which("pdftotext") is not None
+
+    @cached_property
+    def office_server(self):
+        """Shared warm LibreOffice service, or None (per-file soffice is used)."""
+        if not self.has_soffice:
+            return None
+        return get_office_server(self.has_soffice)
+
+    @cached_property
+    def soffice_timeout(self) -> float:
+        """Seconds allowed per document in a soffice run ([converter] timeout)."""
+        from .config import load_config
+
+        converter_cfg = load_config().get("converter", {})
+        return float(converter_cfg.get("timeout", SOFFICE_TIMEOUT))
+
+    @cached_property
+    def conversion_cache(self):
+        """Content-keyed cache of PDF/Markdown outputs, or None if disabled."""
+        return get_conversion_cache()
+
+    def _cache_key(self, input_path: str, kind: str, tool: str) -> Optional[str]:
+        if self.conversion_cache is None:
+            return None
+        try:
+            return self.conversion_cache.make_key(input_path, kind, tool)
+        except OSError:
+            return None
 
     def _find_soffice(self) -> Optional[str]:
         """Find LibreOffice executable."""
@@ -32,7 +220,6 @@ class Converter:
     def check_dependencies(self) -> dict:
         """Check availability of external tools."""
         return {
-            "unzip": self.has_unzip,
             "pandoc": self.has_pandoc,
             "libreoffice": self.has_soffice is not None,
             "inkscape": self.has_inkscape,
@@ -41,127 +228,196 @@ class Converter:
 
     def extract_zip(self, zip_path: str, output_dir: str) -> bool:
         """
-        Extract ZIP file with encoding handling.
-        Tries to use system 'unzip' command first for better encoding support (cp932),
-        falls back to Python's zipfile.
+        Extract all files of a ZIP into output_dir (see extract_zip_members).
+        Returns False if the archive is corrupt or exceeds the ZIP_* limits.
         """
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-
-        # Try system unzip first if available (especially for macOS/Linux with encoding flags)
-        if self.has_unzip:
-            try:
-                cmd = ["unzip", "-q", "-o"]
-
-                # Add encoding flag for macOS if supported (usually checks if it accepts -O)
-                # For simplicity based on the script, we'll try to use it if we are on macOS
-                # The script checked `unzip -h 2>&1 | grep -- "-O"`
-                # Here we assume if it's macOS we might want cp932 for 3GPP
 
-                use_encoding_flag = False
-                if self.os_type == "Darwin":
-                    # Quick check if unzip supports -O
-                    try:
-                        help_out = subprocess.check_output(
-                            ["unzip", "-h"], stderr=subprocess.STDOUT
-                        ).decode()
-                        if "-O CHAR" in help_out or "-O charset" in help_out:
-                            use_encoding_flag = True
-                    except Exception:
-                        pass
-
-                if use_encoding_flag:
-                    cmd.extend(["-O", "cp932"])
+        def select(names: List[str]) -> Dict[str, str]:
+            targets = {}
+            for name in names:
+                # Never write outside output_dir
+                parts = [
+                    part
+                    for part in name.replace("\\", "/").split("/")
+                    if part not in ("", ".", "..")
+                ]
+                if parts:
+                    targets[name] = os.path.join(output_dir, *parts)
+            return targets
 
-                cmd.extend([zip_path, "-d", output_dir])
+        return self.extract_zip_members(zip_path, select) is not None
 
-                subprocess.run(cmd, check=True, capture_output=True)
-                return True
-            except subprocess.CalledProcessError as e:
-                logger.warning(
-                    f"System unzip failed: {e}. Falling back to python zipfile."
-                )
-            except Exception as e:
-                logger.warning(
-                    f"Error using system unzip: {e}. Falling back to python zipfile."
-                )
-
-        # Fallback to Python zipfile
+    def extract_zip_members(
+        self, zip_path: str, select: Callable[[List[str]], Dict[str, str]]
+    ) -> Optional[Dict[str, str]]:
+        """
+        Stream chosen members of a ZIP straight to their destination paths.
+
+        `select` receives the decoded names of all file members and returns
+        {name: destination path} for the ones to extract; nothing else is
+        decompressed. Names without the UTF-8 flag are decoded as UTF-8 or
+        cp932 when possible (archives made on Japanese Windows), else cp437.
+        Returns {name: path written}, or None if the archive is corrupt or
+        exceeds the ZIP_* limits (checked before anything is written).
+        """
         try:
             with zipfile.ZipFile(zip_path, "r") as zf:
-                # Python's zipfile doesn't support cp932 decoding for filenames easily before extracting
-                # But we can try to iterate and decode manually if needed,
-                # or just extractall which uses cp437 or utf-8.
-                # For now, standard extractall.
-                zf.extractall(output_dir)
-            return True
+                infos = [info for info in zf.infolist() if not info.is_dir()]
+                if len(infos) > ZIP_MAX_MEMBERS:
+                    raise ZipLimitError(f"{len(infos)} members")
+
+                members = {zip_member_name(info): info for info in infos}
+                targets = select(list(members))
+
+                total = 0
+                for name in targets:
+                    info = members[name]
+                    _check_zip_member(name, info)
+                    total += info.file_size
+                    if total > ZIP_MAX_TOTAL_SIZE:
+                        raise ZipLimitError(
+                            f"total size over {ZIP_MAX_TOTAL_SIZE} bytes"
+                        )
+
+                for name, dest_path in targets.items():
+                    _extract_zip_member(zf, members[name], dest_path)
+                return dict(targets)
+        except ZipLimitError as e:
+            logger.error(f"Refusing to extract {zip_path}: {e}")
+            return None
         except Exception as e:
             logger.error(f"Failed to extract zip {zip_path}: {e}")
-            return False
+            return None
 
     def convert_to_pdf(self, input_path: str, output_dir: str) -> Optional[str]:
         """
         Convert document to PDF using LibreOffice.
         Returns the path to the generated PDF or None if failed.
         """
+        return self.convert_many_to_pdf([input_path], output_dir)[input_path]
+
+    def convert_many_to_pdf(
+        self,
+        input_paths: List[str],
+        output_dir: str,
+        batch_size: int = SOFFICE_BATCH_SIZE,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Convert several documents to PDF in output_dir.
+        Returns a mapping of input path -> generated PDF path (None if failed).
+
+        With the office server, documents are queued to it. Otherwise they are
+        passed to soffice up to `batch_size` at a time, so the process startup
+        is paid once per batch (timeout: `soffice_timeout` seconds per document).
+        When a batch fails, the documents without output are retried in halves
+        until the one that breaks soffice is isolated.
+        """
+        results: Dict[str, Optional[str]] = {path: None for path in input_paths}
+        if not input_paths:
+            return results
+
         if not self.has_soffice:
             logger.warning("LibreOffice (soffice) not found. Skipping PDF conversion.")
-            return None
+            return results
 
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        filename = os.path.basename(input_path)
-        base_name = os.path.splitext(filename)[0]
-        expected_pdf_path = os.path.join(output_dir, f"{base_name}.pdf")
+        # Reuse PDFs of identical documents converted before
+        pending = []
+        cache_keys: Dict[str, str] = {}
+        tool = tool_id(self.has_soffice)
+        for path in results:
+            key = self._cache_key(path, "pdf", tool)
+            if key is not None:
+                pdf_path = _pdf_path(path, output_dir)
+                if self.conversion_cache.get_pdf(key, pdf_path):
+                    results[path] = pdf_path
+                    continue
+                cache_keys[path] = key
+            pending.append(path)
+
+        if self.office_server is not None and pending:
+            futures = [
+                (path, self.office_server.submit(path, _pdf_path(path, output_dir)))
+                for path in pending
+            ]
+            pending = []
+            for path, future in futures:
+                try:
+                    results[path] = future.result()
+                except OfficeUnavailable:
+                    pending.append(path)
+                except OfficeError as e:
+                    logger.error(f"PDF conversion failed for {path}: {e}")
 
+            if pending:
+                logger.warning(
+                    "LibreOffice server unavailable. Falling back to soffice per batch."
+                )
+                disable_office_server()
+                self.office_server = None
+
+        for batch in _soffice_batches(pending, batch_size):
+            self._convert_batch(batch, output_dir, results)
+
+        for path, key in cache_keys.items():
+            if results[path]:
+                self.conversion_cache.put_pdf(key, results[path])
+        return results
+
+    def _convert_batch(
+        self, batch: List[str], output_dir: str, results: Dict[str, Optional[str]]
+    ):
+        """Run one soffice process for `batch`, bisecting on failure."""
+        started = time.time()
+        error = None
         try:
-            # Create a temporary profile directory to avoid conflicts
-            # Using subprocess to call soffice
-            # --headless --convert-to pdf --outdir ...
-
-            # Note: soffice is sensitive to user profile locking.
-            # The script used a temp profile dir.
-            import tempfile
-
-            with tempfile.TemporaryDirectory() as temp_profile_dir:
-                # env = os.environ.copy()
-                # env['UserInstallation'] = f"file://{temp_profile_dir}" # This format depends on OS?
-                # The script used -env:UserInstallation="file://$temp_profile_dir" as argument
-
-                cmd = [
-                    self.has_soffice,
-                    f"-env:UserInstallation=file://{temp_profile_dir}",
-                    "--headless",
-                    "--convert-to",
-                    "pdf",
-                    input_path,
-                    "--outdir",
-                    output_dir,
-                ]
-
-                # Set a timeout (e.g., 60 seconds)
-                subprocess.run(cmd, check=True, capture_output=True, timeout=60)
-
-                if os.path.exists(expected_pdf_path):
-                    return expected_pdf_path
-                else:
-                    logger.error(
-                        f"PDF conversion ran but output file not found: {expected_pdf_path}"
-                    )
-                    return None
-
+            # soffice is sensitive to user profile locking: every thread uses its
+            # own profile, kept for the life of the process so later runs skip
+            # the first-start profile setup.
+            cmd = [
+                self.has_soffice,
+                f"-env:UserInstallation=file://{_thread_profile_dir()}",
+                "--headless",
+                "--convert-to",
+                "pdf",
+                "--outdir",
+                output_dir,
+                *batch,
+            ]
+            _run_soffice(cmd, self.soffice_timeout * len(batch))
         except subprocess.TimeoutExpired:
-            logger.error(f"PDF conversion timed out for {input_path}")
-            return None
+            error = "timed out"
         except subprocess.CalledProcessError as e:
-            logger.error(
-                f"PDF conversion failed for {input_path}: {e.stderr.decode() if e.stderr else str(e)}"
-            )
-            return None
+            error = e.stderr.decode() if e.stderr else str(e)
         except Exception as e:
-            logger.error(f"Unexpected error during PDF conversion: {e}")
-            return None
+            error = f"unexpected error: {e}"
+
+        # soffice writes <stem>.pdf per input; anything older than this run is stale
+        failed = []
+        for path in batch:
+            pdf_path = _pdf_path(path, output_dir)
+            if os.path.exists(pdf_path) and os.path.getmtime(pdf_path) >= started - 1:
+                results[path] = pdf_path
+            else:
+                failed.append(path)
+
+        if not failed:
+            return
+        if len(batch) == 1:
+            if error:
+                logger.error(f"PDF conversion failed for {batch[0]}: {error}")
+            else:
+                logger.error(
+                    f"PDF conversion ran but output file not found: {_pdf_path(batch[0], output_dir)}"
+                )
+            return
+
+        middle = len(failed) // 2 or 1
+        for half in (failed[:middle], failed[middle:]):
+            if half:
+                self._convert_batch(half, output_dir, results)
 
     def convert_to_markdown(self, input_path: str, output_dir: str) -> Optional[str]:
         """
@@ -171,7 +427,32 @@ class Converter:
         - .pdf -> Markdown (via pdftotext, basic text extraction)
 
         Returns the path to the generated Markdown file or None if failed.
+        Results of identical input files are reused from the conversion cache.
         """
+        ext = os.path.splitext(input_path)[1].lower()
+        if ext == ".pdf":
+            tool = tool_id("pdftotext") if self.has_pdftotext else None
+        elif ext in [".docx", ".doc", ".odt"] and self.has_pandoc:
+            tool = tool_id("pandoc")
+            if self.has_inkscape:
+                tool += "|" + tool_id("inkscape")
+        else:
+            tool = None
+        key = self._cache_key(input_path, "md", tool) if tool else None
+
+        base_name = os.path.splitext(os.path.basename(input_path))[0]
+        output_path = os.path.join(output_dir, f"{base_name}.md")
+        if key is not None:
+            os.makedirs(output_dir, exist_ok=True)
+            if self.conversion_cache.get_markdown(key, output_path, output_dir):
+                return output_path
+
+        result = self._convert_to_markdown(input_path, output_dir)
+        if result and key is not None:
+            self.conversion_cache.put_markdown(key, result, output_dir)
+        return result
+
+    def _convert_to_markdown(self, input_path: str, output_dir: str) -> Optional[str]:
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
@@ -0,0 +1,160 @@
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+from .fetchers.models import Paper
+
+if TYPE_CHECKING:
+    from .fetchers.base import BaseFetcher
+
+
+@dataclass
+class DownloadTask:
+    fetcher: "BaseFetcher"
+    paper: Paper
+    save_dir: str
+    options: Dict[str, Any] = field(default_factory=dict)  # Extra download_pdf kwargs
+    # Called when the task starts (None, None), then per chunk with (received, total)
+    on_progress: Optional[Callable[[Optional[int], Optional[int]], None]] = None
+
+    @property
+    def host(self) -> str:
+        """Host the download will hit; tasks for the same host never run concurrently."""
+        url = self.paper.pdf_url or self.paper.url
+        return urlparse(url).netloc.lower() if url else self.paper.source
+
+
+@dataclass
+class DownloadResult:
+    task: DownloadTask
+    path: Optional[str] = None
+    error: Optional[Exception] = None
+
+    @property
+    def paper(self) -> Paper:
+        return self.task.paper
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class DownloadEngine:
+    """
+    Runs download tasks on a worker pool.
+    Tasks are grouped into per-host lanes: lanes run in parallel (up to `jobs`),
+    while tasks inside a lane run one after another so each host still gets
+    its fetcher's politeness interval between downloads.
+    """
+
+    def __init__(self, jobs: Optional[int] = None):
+        if jobs is None:
+            from .config import load_config
+
+            jobs = load_config().get("core", {}).get("download_jobs", 1)
+        self.jobs = max(1, int(jobs or 1))
+
+    def _run_task(self, task: DownloadTask) -> DownloadResult:
+        """
+        Download one task. If the fetcher deferred post-processing (e.g. 3GPP
+        PDF conversion), `path` is a Future; see _resolve.
+        """
+        from .conversion import defer_conversions
+
+        try:
+            with defer_conversions():
+                if task.on_progress is None:
+                    path = task.fetcher.download_pdf(
+                        task.paper, task.save_dir, **task.options
+                    )
+                else:
+                    from .fetchers.http import observe_transfers
+
+                    task.on_progress(None, None)
+                    with observe_transfers(task.on_progress):
+                        path = task.fetcher.download_pdf(
+                            task.paper, task.save_dir, **task.options
+                        )
+            return DownloadResult(task=task, path=path)
+        except Exception as e:
+            return DownloadResult(task=task, error=e)
+
+    @staticmethod
+    def _resolve(result: DownloadResult) -> DownloadResult:
+        """Wait for deferred post-processing and return the final result."""
+        if isinstance(result.path, Future):
+            try:
+                return DownloadResult(task=result.task, path=result.path.result())
+            except Exception as e:
+                return DownloadResult(task=result.task, error=e)
+        return result
+
+    def _lanes(self, tasks: List[DownloadTask]) -> List[List[DownloadTask]]:
+        lanes: Dict[str, List[DownloadTask]] = {}
+        for task in tasks:
+            lanes.setdefault(task.host, []).append(task)
+        return list(lanes.values())
+
+    def iter_run(self, tasks: List[DownloadTask]) -> Iterator[DownloadResult]:
+        """Run tasks and yield each result as soon as it completes."""
+        lanes = self._lanes(tasks)
+
+        # Nothing to parallelize: run inline so callers keep their thread context.
+        # Deferred results are yielded once done, while later downloads run.
+        if self.jobs == 1 or len(lanes) <= 1:
+            pending: List[DownloadResult] = []
+            for task in tasks:
+                result = self._run_task(task)
+                if isinstance(result.path, Future):
+                    pending.append(result)
+                else:
+                    yield result
+                for result in [r for r in pending if r.path.done()]:
+                    pending.remove(result)
+                    yield self._resolve(result)
+            # Flush: wait for conversions still running after the last download
+            for result in pending:
+                yield self._resolve(result)
+            return
+
+        results: "queue.Queue[DownloadResult]" = queue.Queue()
+        stop = threading.Event()
+
+        def run_lane(lane: List[DownloadTask]):
+            for task in lane:
+                if stop.is_set():
+                    return
+                result = self._run_task(task)
+                if isinstance(result.path, Future):
+                    # Hand the lane back to downloads; report when processing ends
+                    result.path.add_done_callback(
+                        lambda _, result=result: results.put(self._resolve(result))
+                    )
+                else:
+                    results.put(result)
+
+        with ThreadPoolExecutor(max_workers=min(self.jobs, len(lanes))) as executor:
+            for lane in lanes:
+                executor.submit(run_lane, lane)
+            try:
+                for _ in range(len(tasks)):
+                    yield results.get()
+            finally:
+                # Caller stopped consuming: let lanes finish their current task and exit
+                stop.set()
+
+    def run(
+        self,
+        tasks: List[DownloadTask],
+        on_result: Optional[Callable[[DownloadResult], None]] = None,
+    ) -> List[DownloadResult]:
+        """Run tasks and return results in completion order."""
+        done = []
+        for result in self.iter_run(tasks):
+            if on_result:
+                on_result(result)
+            done.append(result)
+        return done
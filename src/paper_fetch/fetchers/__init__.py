@@ -1 +1,7 @@
-from .uspto import UsptoFetcher as UsptoFetcher
+def __getattr__(name):
+    # Import fetcher modules on demand so `paper_fetch.fetchers.models` stays cheap
+    if name == "UsptoFetcher":
+        from .uspto import UsptoFetcher
+
+        return UsptoFetcher
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
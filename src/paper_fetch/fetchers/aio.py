@@ -0,0 +1,119 @@
+import asyncio
+import threading
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, List, Optional
+
+from .models import Paper
+from .ratelimit import prepaid_slot
+
+if TYPE_CHECKING:
+    from .base import BaseFetcher
+    from .ratelimit import TokenBucket
+
+# Marks the end of a bridged iter_search stream
+_DONE = object()
+
+
+class AsyncFetcher:
+    """
+    Asyncio interface to a fetcher.
+
+    Rate-limit slots are reserved on the event loop and their wait is awaited with
+    `asyncio.sleep`, so a coroutine waiting 40 seconds for its download turn holds no
+    thread; the worker thread then uses that slot instead of reserving its own (see
+    ratelimit.prepaid_slot). Only the actual HTTP transfer and parsing run in a worker thread,
+    through the same pooled sessions, limiters and response cache as the sync API.
+    Any number of AsyncFetcher instances and sync callers can share one process.
+    """
+
+    def __init__(self, fetcher: "BaseFetcher", executor: Optional[Executor] = None):
+        self.fetcher = fetcher
+        self.executor = executor  # None: the loop's default executor
+
+    @property
+    def source_name(self) -> str:
+        return self.fetcher.source_name
+
+    async def _run(
+        self, slot: Optional["TokenBucket"], func: Callable[..., Any], *args, **kwargs
+    ) -> Any:
+        """Run `func` in the executor; `slot` is the limiter prepaid by _reserve_slot."""
+
+        def call():
+            with prepaid_slot(slot):
+                return func(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, call)
+
+    async def _reserve_slot(
+        self, kind: str, url: Optional[str]
+    ) -> Optional["TokenBucket"]:
+        """
+        Reserve the next slot of the limiter and sleep on the loop until it is due.
+        Returns the limiter, to be passed on to the worker thread (None if not limited).
+        """
+        if url is None:
+            return None
+        limiter = self.fetcher._limiter(kind, url)
+        delay = limiter.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return limiter
+
+    async def search(self, query: str, max_results: int = 10, **kwargs) -> List[Paper]:
+        """Search for papers and return them all."""
+        return [p async for p in self.aiter_search(query, max_results, **kwargs)]
+
+    async def aiter_search(
+        self, query: str, max_results: int = 10, **kwargs
+    ) -> AsyncIterator[Paper]:
+        """
+        Async version of `iter_search`: papers are yielded as the worker thread
+        parses them. Leaving the loop early stops the worker after its current page.
+        """
+        slot = await self._reserve_slot("search", self.fetcher.search_limit_url())
+
+        loop = asyncio.get_running_loop()
+        items: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        def produce():
+            try:
+                with prepaid_slot(slot):
+                    for paper in self.fetcher.iter_search(
+                        query, max_results=max_results, **kwargs
+                    ):
+                        if stop.is_set():
+                            break
+                        loop.call_soon_threadsafe(items.put_nowait, paper)
+                loop.call_soon_threadsafe(items.put_nowait, _DONE)
+            except Exception as e:
+                loop.call_soon_threadsafe(items.put_nowait, e)
+
+        worker = loop.run_in_executor(self.executor, produce)
+        try:
+            while True:
+                item = await items.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            if worker.done():
+                worker.result()
+
+    async def download_pdf(self, paper: Paper, save_dir: str, **kwargs) -> str:
+        """Download a paper, waiting for the download slot without blocking the loop."""
+        slot = await self._reserve_slot(
+            "download", self.fetcher.download_limit_url(paper)
+        )
+        return await self._run(
+            slot, self.fetcher.download_pdf, paper, save_dir, **kwargs
+        )
+
+    async def get_total_results(self, query: str, **kwargs) -> int:
+        slot = await self._reserve_slot("search", self.fetcher.search_limit_url())
+        return await self._run(slot, self.fetcher.get_total_results, query, **kwargs)
@@ -1,25 +1,37 @@
 import arxiv
 import os
-import requests
-from typing import List
+from typing import Iterator, Optional
 from .base import BaseFetcher
 from .models import Paper
-from .utils import generate_filename
+from .utils import generate_filename, load_checkpoint, save_checkpoint, clear_checkpoint
 
 from ..converter import Converter
 
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+ARXIV_MAX_PAGE_SIZE = 2000  # Largest page the arXiv API serves per request
+
 
 class ArxivFetcher(BaseFetcher):
+    source_name = "arxiv"
+
     def __init__(self):
         super().__init__(search_delay=3.0, download_delay=20.0)
-        self.client = arxiv.Client(
-            page_size=10,
-            delay_seconds=3.0,  # arxiv library also has its own delay, but we enforce ours globally
-            num_retries=3,
-        )
         self.converter = Converter()
 
-    def search(
+    def search_limit_url(self) -> Optional[str]:
+        return ARXIV_API_URL
+
+    def download_limit_url(self, paper: Paper) -> Optional[str]:
+        return paper.pdf_url
+
+    @staticmethod
+    def _page_size(max_results: Optional[int]) -> int:
+        """Fetch as much as needed per round trip, up to the API maximum."""
+        if not max_results:
+            return ARXIV_MAX_PAGE_SIZE
+        return max(1, min(max_results, ARXIV_MAX_PAGE_SIZE))
+
+    def iter_search(
         self,
         query: str,
         max_results: int = 10,
@@ -27,8 +39,16 @@ class ArxivFetcher(BaseFetcher):
         sort_order: str = "desc",
         start_year: int = None,
         end_year: int = None,
-    ) -> List[Paper]:
-        self._wait_for_search()
+        checkpoint: str = None,
+        **kwargs,
+    ) -> Iterator[Paper]:
+        """
+        Stream papers page by page as they arrive.
+        checkpoint: optional JSON file recording the offset reached. If the file
+        matches this query, the harvest resumes from that offset (yielding only the
+        remaining papers); it is removed once the result set is exhausted.
+        """
+        self._wait_for_search(self.search_limit_url())
         # Map sort_by
         criterion = arxiv.SortCriterion.Relevance
         if sort_by == "date":
@@ -54,12 +74,27 @@ class ArxivFetcher(BaseFetcher):
             sort_order=order,
         )
 
-        results = []
-        for result in self.client.results(search):
+        page_size = self._page_size(max_results)
+        client = arxiv.Client(
+            page_size=page_size,
+            delay_seconds=3.0,  # Required by arXiv between pages; our limiter only gates the first
+            num_retries=3,
+        )
+
+        signature = {
+            "source": "arxiv",
+            "query": final_query,
+            "sort_by": sort_by,
+            "sort_order": sort_order,
+            "max_results": max_results,
+        }
+        offset = load_checkpoint(checkpoint, signature) if checkpoint else 0
+
+        for result in client.results(search, offset=offset):
             # Convert arxiv.Result to our Paper model
             published_date = result.published.date() if result.published else None
 
-            paper = Paper(
+            yield Paper(
                 source="arxiv",
                 id=result.entry_id.split("/")[-1],  # Extract ID from URL
                 title=result.title,
@@ -69,14 +104,17 @@ class ArxivFetcher(BaseFetcher):
                 pdf_url=result.pdf_url,
                 published_date=published_date,
             )
-            results.append(paper)
 
-        return results
+            offset += 1
+            if checkpoint and offset % page_size == 0:
+                save_checkpoint(checkpoint, signature, offset)
+
+        if checkpoint:
+            clear_checkpoint(checkpoint)
 
     def get_total_results(
         self, query: str, start_year: int = None, end_year: int = None, **kwargs
     ) -> int:
-        self._wait_for_search()
         import xml.etree.ElementTree as ET
 
         # Handle date filtering for query construction
@@ -86,11 +124,17 @@ class ArxivFetcher(BaseFetcher):
             end_str = f"{end_year}12312359" if end_year else "209912312359"
             final_query = f"{query} AND submittedDate:[{start_str} TO {end_str}]"
 
-        url = "http://export.arxiv.org/api/query"
         params = {"search_query": final_query, "start": 0, "max_results": 1}
 
         try:
-            response = requests.get(url, params=params, timeout=20)
+            response = self._request(
+                "GET",
+                ARXIV_API_URL,
+                params=params,
+                timeout=20,
+                rate_limit="search",
+                cache=True,
+            )
             response.raise_for_status()
             root = ET.fromstring(response.content)
             ns = {"opensearch": "http://a9.com/-/spec/opensearch/1.1/"}
@@ -110,7 +154,7 @@ class ArxivFetcher(BaseFetcher):
         method: str = "default",
         **kwargs,
     ) -> str:
-        self._wait_for_download()
+        self._wait_for_download(self.download_limit_url(paper))
         if not os.path.exists(save_dir):
             os.makedirs(save_dir)
 
@@ -121,14 +165,9 @@ class ArxivFetcher(BaseFetcher):
 
         # Use requests to download to have full control over the file creation
         # arxiv library's download_pdf sometimes has issues with custom filenames or paths
-        response = requests.get(paper.pdf_url, stream=True)
-        response.raise_for_status()
-
-        with open(filepath, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        self._download_file(paper.pdf_url, filepath)
 
         if convert_to_md:
             self.converter.convert_to_markdown(filepath, save_dir)
 
-        return filepath
+        return self._record_download(paper, filepath)
@@ -1,8 +1,32 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional, Callable
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple, Optional, Callable
+import threading
 import time
-import random
+import requests
+from urllib.parse import urlparse
 from .models import Paper
+from .http import get_session, download_to_file
+from .cache import get_cache
+from .ratelimit import TokenBucket, get_limiter, report_status, take_prepaid
+
+# Wait-progress callback of the caller running on this thread (see report_progress)
+_progress = threading.local()
+
+
+@contextmanager
+def report_progress(callback: Optional[Callable[[str], None]]) -> Iterator[None]:
+    """
+    Report rate-limit waits of fetcher calls made on this thread to `callback`.
+    Unlike set_progress_callback this does not touch the fetcher, so a fetcher
+    shared between callers (e.g. GUI sessions) keeps each caller's output apart.
+    """
+    previous = getattr(_progress, "callback", None)
+    _progress.callback = callback
+    try:
+        yield
+    finally:
+        _progress.callback = previous
 
 
 class BaseFetcher(ABC):
@@ -32,10 +56,18 @@ class BaseFetcher(ABC):
         self.download_jitter_range = (float(d_min), float(d_max))
         self.download_delay = download_delay if download_delay is not None else d_min
 
-        self.last_search_time = 0.0
-        self.last_download_time = 0.0
+        # Burst sizes for the shared token-bucket limiters
+        self.search_burst = int(advanced_cfg.get("search_burst", 1))
+        self.download_burst = int(advanced_cfg.get("download_burst", 1))
+
+        # Connection pooling settings for the shared per-host sessions
+        self.http_config = self.config.get("http", {})
+
         self.progress_callback: Optional[Callable[[str], None]] = None
 
+    # Source identifier (matches Paper.source); also keys the shared rate limiters
+    source_name: str = ""
+
     # Flags for UI
     supports_download_methods: bool = False
     available_download_methods: List[str] = []
@@ -61,49 +93,199 @@ class BaseFetcher(ABC):
         """Return the range of possible wait times for download (min, max)."""
         return self.download_jitter_range
 
-    def _wait_with_callback(
-        self, required_wait: float, last_time: float, action_name: str
-    ):
+    def _limiter(self, kind: str, url: Optional[str] = None) -> TokenBucket:
+        """Return the process-wide limiter for this source and the host of `url`."""
+        host = urlparse(url).netloc.lower() if url else ""
+        if kind == "search":
+            return get_limiter(
+                self.source_name,
+                host,
+                kind,
+                self.search_jitter_range,
+                self.search_burst,
+            )
+        return get_limiter(
+            self.source_name,
+            host,
+            kind,
+            self.download_jitter_range,
+            self.download_burst,
+        )
+
+    def next_search_slot(self, url: Optional[str] = None) -> float:
+        """Seconds until the next search may start (non-blocking, consumes nothing)."""
+        return self._limiter("search", url).next_slot()
+
+    def next_download_slot(self, url: Optional[str] = None) -> float:
+        """Seconds until the next download may start (non-blocking, consumes nothing)."""
+        return self._limiter("download", url).next_slot()
+
+    def search_limit_url(self) -> Optional[str]:
+        """URL whose host keys this source's search limiter (None if not rate limited)."""
+        return None
+
+    def download_limit_url(self, paper: Paper) -> Optional[str]:
+        """URL whose host keys the download limiter for `paper`."""
+        return None
+
+    def _sleep_with_callback(self, sleep_time: float, action_name: str):
         """Common wait logic with callback support."""
-        elapsed = time.time() - last_time
-        if elapsed < required_wait:
-            sleep_time = required_wait - elapsed
-
-            # If we have a callback and sleep time is significant, show countdown
-            if self.progress_callback and sleep_time > 0.5:
-                remaining = sleep_time
-                while remaining > 0:
-                    # Update message
-                    msg = f"Rate limit: Waiting for {action_name}... ({remaining:.1f}s)"
-                    self.progress_callback(msg)
-
-                    # Sleep in small chunks
-                    chunk = min(0.1, remaining)
-                    time.sleep(chunk)
-                    remaining -= chunk
-
-                # Clear message after done
-                self.progress_callback("")
-            else:
-                time.sleep(sleep_time)
-
-    def _wait_for_search(self):
-        """Enforce rate limit for search with jitter."""
-        # Use full range from config
-        wait_time = random.uniform(*self.search_jitter_range)
-
-        self._wait_with_callback(wait_time, self.last_search_time, "search")
-        self.last_search_time = time.time()
-
-    def _wait_for_download(self):
-        """Enforce rate limit for download with significant jitter."""
-        wait_time = random.uniform(*self.download_jitter_range)
-
-        self._wait_with_callback(wait_time, self.last_download_time, "download")
-        self.last_download_time = time.time()
+        if sleep_time <= 0:
+            return
+
+        callback = getattr(_progress, "callback", None) or self.progress_callback
+        # If we have a callback and sleep time is significant, show countdown
+        if callback and sleep_time > 0.5:
+            remaining = sleep_time
+            while remaining > 0:
+                # Update message
+                msg = f"Rate limit: Waiting for {action_name}... ({remaining:.1f}s)"
+                callback(msg)
+
+                # Sleep in small chunks
+                chunk = min(0.1, remaining)
+                time.sleep(chunk)
+                remaining -= chunk
+
+            # Clear message after done
+            callback("")
+        else:
+            time.sleep(sleep_time)
+
+    def _session(self, url: str) -> requests.Session:
+        """Return the pooled session shared by all fetchers for the host of `url`."""
+        return get_session(url, self.http_config)
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        rate_limit: Optional[str] = None,
+        cache: bool = False,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request through the pooled session for the target host.
+        429/503 responses slow down this source's limiters for the host.
+
+        rate_limit: "search" or "download" to wait for that limiter first.
+                    Cache hits are served without waiting.
+        cache: serve/store the response in the on-disk response cache ([cache]).
+        """
+        response_cache = get_cache(self.config.get("cache", {})) if cache else None
+        if response_cache is None or kwargs.get("stream"):
+            return self._send(method, url, rate_limit, **kwargs)
+
+        prepared = requests.Request(
+            method,
+            url,
+            params=kwargs.get("params"),
+            data=kwargs.get("data"),
+            json=kwargs.get("json"),
+        ).prepare()
+        body = (
+            prepared.body.encode() if isinstance(prepared.body, str) else prepared.body
+        )
+        key = response_cache.make_key(
+            prepared.method, prepared.url, body, kwargs.get("headers")
+        )
+
+        entry = response_cache.get(key)
+        if entry is not None:
+            if entry["age"] < self._cache_ttl():
+                return response_cache.to_response(key, entry)
+
+            # Stale: revalidate if the server gave us validators
+            headers = dict(kwargs.pop("headers", None) or {})
+            if "ETag" in entry["headers"]:
+                headers["If-None-Match"] = entry["headers"]["ETag"]
+            if "Last-Modified" in entry["headers"]:
+                headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+            kwargs["headers"] = headers
+
+        response = self._send(method, url, rate_limit, **kwargs)
+        if entry is not None and response.status_code == 304:
+            response_cache.touch(key)
+            return response_cache.to_response(key, entry)
+        if response.status_code == 200:
+            response_cache.put(key, response)
+        return response
+
+    def _send(
+        self, method: str, url: str, rate_limit: Optional[str] = None, **kwargs
+    ) -> requests.Response:
+        if rate_limit == "search":
+            self._wait_for_search(url)
+        elif rate_limit == "download":
+            self._wait_for_download(url)
+
+        response = self._session(url).request(method, url, **kwargs)
+        report_status(
+            self.source_name,
+            urlparse(url).netloc.lower(),
+            response.status_code,
+            response.headers.get("Retry-After"),
+        )
+        return response
+
+    def _cache_ttl(self) -> float:
+        """Seconds a cached response stays fresh for this source."""
+        cache_cfg = self.config.get("cache", {})
+        ttl = cache_cfg.get("ttl", {}).get(self.source_name)
+        return float(ttl if ttl is not None else cache_cfg.get("default_ttl", 3600))
+
+    def _download_file(
+        self,
+        url: str,
+        filepath: str,
+        headers: Optional[dict] = None,
+        timeout: float = 60,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """
+        Resumable download of `url` to `filepath` (written as `.part`, renamed when
+        complete). Retries on dropped connections per [http] download_retries.
+        """
+        return download_to_file(
+            self._request,
+            url,
+            filepath,
+            headers=headers,
+            timeout=timeout,
+            content_type=content_type,
+            retries=int(self.http_config.get("download_retries", 3)),
+        )
+
+    def _record_download(self, paper: Paper, path: str) -> str:
+        """Add a saved file to the downloaded-file index ([library]) and return its path."""
+        from ..library import get_library
+
+        try:
+            library = get_library(self.config.get("library", {}))
+            if library is not None:
+                library.record_download(paper, path)
+        except Exception as e:
+            # The index is a convenience; never fail a finished download over it
+            print(f"Warning: Failed to record download of {path}: {e}")
+        return path
+
+    def _reserve(self, kind: str, url: Optional[str]) -> float:
+        """Reserve a slot and return the wait, unless the caller prepaid it."""
+        limiter = self._limiter(kind, url)
+        if take_prepaid(limiter):
+            return 0.0
+        return limiter.reserve()
+
+    def _wait_for_search(self, url: Optional[str] = None):
+        """Enforce the shared search rate limit for this source (and host of `url`)."""
+        self._sleep_with_callback(self._reserve("search", url), "search")
+
+    def _wait_for_download(self, url: Optional[str] = None):
+        """Enforce the shared download rate limit for this source (and host of `url`)."""
+        self._sleep_with_callback(self._reserve("download", url), "download")
 
     @abstractmethod
-    def search(
+    def iter_search(
         self,
         query: str,
         max_results: int = 10,
@@ -111,10 +293,18 @@ class BaseFetcher(ABC):
         sort_order: str = "desc",
         start_year: int = None,
         end_year: int = None,
-    ) -> List[Paper]:
-        """Search for papers by query."""
-        self._wait_for_search()
-        pass
+        **kwargs,
+    ) -> Iterator[Paper]:
+        """
+        Search for papers by query, yielding each Paper as soon as it is parsed.
+        Implementations page through the source lazily, so consumers can filter or
+        download early results while later ones are still being fetched.
+        max_results: None for all available results.
+        """
+
+    def search(self, query: str, max_results: int = 10, **kwargs) -> List[Paper]:
+        """Search for papers by query and return them all (wraps iter_search)."""
+        return list(self.iter_search(query, max_results=max_results, **kwargs))
 
     @abstractmethod
     @abstractmethod
@@ -140,10 +330,12 @@ class BaseFetcher(ABC):
         self._wait_for_search()
         return -1  # Default to -1 if not implemented
 
-    def get_query_dirname(self, query: str) -> str:
+    @classmethod
+    def get_query_dirname(cls, query: str) -> str:
         """
         Generate a safe directory name from the query.
         Default implementation sanitizes the query string.
+        Classmethod, so callers don't need to build a fetcher just for this.
         """
         import re
 
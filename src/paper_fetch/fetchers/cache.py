@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Response headers worth keeping; the body is stored decoded, so length/encoding are dropped
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Date")
+
+# Request headers that change the response (representation or credentials): they are
+# part of the key, so a response fetched with one API key is never served to another
+VARY_HEADERS = ("Accept", "Authorization", "X-Api-Key")
+
+
+class ResponseCache:
+    """
+    Disk-backed cache of HTTP responses for search and listing calls.
+
+    Each entry is a `<key>.json` metadata file plus a `<key>.body` file, where the key
+    is the SHA-256 of method, URL, request body and the VARY_HEADERS sent. Entries older than their TTL are
+    revalidated with If-None-Match / If-Modified-Since when the server sent validators.
+    The directory is capped at `max_size` bytes; the least recently used entries
+    (by metadata mtime, refreshed on every hit) are evicted first.
+    """
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> str:
+        digest = hashlib.sha256()
+        digest.update(method.upper().encode())
+        digest.update(b"\0" + url.encode())
+        digest.update(b"\0" + (body or b""))
+        if headers:
+            headers = CaseInsensitiveDict(headers)
+            for name in VARY_HEADERS:
+                if name in headers:
+                    digest.update(f"\0{name.lower()}:{headers[name]}".encode())
+        return digest.hexdigest()
+
+    def _paths(self, key: str):
+        base = os.path.join(self.directory, key)
+        return base + ".json", base + ".body"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry metadata (with "age" in seconds) or None."""
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if not os.path.exists(body_path):
+                return None
+            os.utime(meta_path)  # Mark as recently used
+        except (OSError, ValueError):
+            return None
+
+        meta["age"] = time.time() - meta.get("stored_at", 0)
+        return meta
+
+    def to_response(self, key: str, meta: Dict[str, Any]) -> requests.Response:
+        """Rebuild a `requests.Response` from a cache entry."""
+        _, body_path = self._paths(key)
+        with open(body_path, "rb") as f:
+            body = f.read()
+
+        response = requests.Response()
+        response.status_code = meta["status"]
+        response.reason = "OK"
+        response.url = meta["url"]
+        response.headers = CaseInsensitiveDict(meta.get("headers", {}))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response.from_cache = True
+        return response
+
+    def put(self, key: str, response: requests.Response):
+        """Store a successful response and enforce the size cap."""
+        meta_path, body_path = self._paths(key)
+        meta = {
+            "status": response.status_code,
+            "url": response.url,
+            "headers": {
+                k: response.headers[k] for k in _KEPT_HEADERS if k in response.headers
+            },
+            "stored_at": time.time(),
+        }
+
+        with self._lock:
+            # Write to temp files first so readers never see partial entries
+            for path, data, mode in (
+                (body_path, response.content, "wb"),
+                (meta_path, json.dumps(meta), "w"),
+            ):
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, mode) as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+
+            self._evict()
+
+    def touch(self, key: str):
+        """Reset the age of an entry after a successful revalidation (304)."""
+        meta_path, _ = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            meta["stored_at"] = time.time()
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        except (OSError, ValueError):
+            pass
+
+    def _evict(self):
+        entries = {}
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                key, ext = os.path.splitext(entry.name)
+                if ext not in (".json", ".body"):
+                    continue
+                stat = entry.stat()
+                total += stat.st_size
+                size, mtime = entries.get(key, (0, 0.0))
+                if ext == ".json":
+                    mtime = stat.st_mtime
+                entries[key] = (size + stat.st_size, mtime)
+
+        if total <= self.max_size:
+            return
+
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            if total <= self.max_size:
+                break
+
+
+_cache: Optional[ResponseCache] = None
+_lock = threading.Lock()
+
+
+def get_cache(cache_cfg: Dict[str, Any]) -> Optional[ResponseCache]:
+    """Return the process-wide response cache, or None if disabled in [cache]."""
+    global _cache
+    if not cache_cfg.get("enabled", True):
+        return None
+
+    with _lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                cache_cfg.get("dir", "~/.cache/paper-fetch/http"),
+                int(float(cache_cfg.get("max_size_mb", 100)) * 1024 * 1024),
+            )
+        return _cache
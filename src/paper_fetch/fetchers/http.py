@@ -0,0 +1,194 @@
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Pooled sessions keyed by host ("scheme://netloc"), shared by every fetcher in the process
+_sessions: Dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+
+def _host_key(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+
+def _build_session(http_cfg: Dict[str, Any]) -> requests.Session:
+    """Create a session with a connection-pooling adapter configured from [http]."""
+    session = requests.Session()
+
+    retries = Retry(
+        total=int(http_cfg.get("max_retries", 2)),
+        backoff_factor=float(http_cfg.get("retry_backoff", 0.5)),
+        status_forcelist=(500, 502, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=int(http_cfg.get("pool_connections", 4)),
+        pool_maxsize=int(http_cfg.get("pool_maxsize", 8)),
+        pool_block=bool(http_cfg.get("pool_block", False)),
+        max_retries=retries,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    if not http_cfg.get("keep_alive", True):
+        # Opt out of connection reuse (e.g. behind proxies that mishandle keep-alive)
+        session.headers["Connection"] = "close"
+
+    return session
+
+
+def get_session(
+    url: str, http_cfg: Optional[Dict[str, Any]] = None
+) -> requests.Session:
+    """
+    Return the shared pooled session for the host of `url`.
+    The session is created on first use with the given [http] settings;
+    later calls for the same host reuse it (and its warm connections and cookies).
+    """
+    key = _host_key(url)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _build_session(http_cfg or {})
+            _sessions[key] = session
+        return session
+
+
+def close_sessions():
+    """Close all pooled sessions (releases their connections)."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+# Per-thread transfer observer: called with (bytes_received, total_or_None) per chunk
+_observer = threading.local()
+
+
+@contextmanager
+def observe_transfers(
+    callback: Callable[[int, Optional[int]], None],
+) -> Iterator[None]:
+    """Report the progress of downloads made by the current thread to `callback`."""
+    previous = getattr(_observer, "callback", None)
+    _observer.callback = callback
+    try:
+        yield
+    finally:
+        _observer.callback = previous
+
+
+class IncompleteDownloadError(requests.exceptions.RequestException):
+    """The transfer ended before Content-Length bytes were received."""
+
+
+def _expected_total(response: requests.Response) -> Optional[int]:
+    """Total file size announced by the server, or None if unknown/compressed."""
+    if response.headers.get("Content-Encoding", "identity") != "identity":
+        return None  # Length refers to the encoded body, not the file
+
+    if response.status_code == 206:
+        match = re.search(r"/(\d+)\s*$", response.headers.get("Content-Range", ""))
+        return int(match.group(1)) if match else None
+
+    length = response.headers.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+def download_to_file(
+    request: Callable[..., requests.Response],
+    url: str,
+    filepath: str,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 60,
+    content_type: Optional[str] = None,
+    retries: int = 3,
+) -> str:
+    """
+    Stream `url` into `filepath` via a `.part` file.
+    Interrupted transfers are resumed with a Range request when the server
+    supports it; the part file is checked against Content-Length and only
+    renamed to `filepath` once complete. A `.part` left by an earlier run is
+    resumed as well.
+
+    request: callable with the signature of `requests.Session.request`.
+    content_type: if set, responses whose Content-Type doesn't contain it are rejected.
+    """
+    part_path = filepath + ".part"
+    notify = getattr(_observer, "callback", None)
+    last_error: Optional[Exception] = None
+
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(min(2**attempt, 10))
+
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        req_headers = dict(headers or {})
+        if offset:
+            req_headers["Range"] = f"bytes={offset}-"
+
+        try:
+            response = request(
+                "GET", url, headers=req_headers, stream=True, timeout=timeout
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            last_error = e
+            continue
+
+        try:
+            if offset and response.status_code == 416:
+                # Stale or already complete part file: start over
+                os.remove(part_path)
+                last_error = IncompleteDownloadError(f"Range not satisfiable: {url}")
+                continue
+
+            response.raise_for_status()
+
+            received_type = response.headers.get("Content-Type", "")
+            if content_type and content_type not in received_type:
+                raise ValueError(
+                    f"Failed to download PDF. Content-Type: {received_type}"
+                )
+
+            if offset and response.status_code != 206:
+                offset = 0  # Server ignored the Range header; rewrite from scratch
+
+            total = _expected_total(response)
+            received = offset
+            with open(part_path, "ab" if offset else "wb") as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    f.write(chunk)
+                    received += len(chunk)
+                    if notify:
+                        notify(received, total)
+
+            size = os.path.getsize(part_path)
+            if total is not None and size != total:
+                raise IncompleteDownloadError(
+                    f"Incomplete download ({size}/{total} bytes): {url}"
+                )
+
+            os.replace(part_path, filepath)
+            return filepath
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+            IncompleteDownloadError,
+        ) as e:
+            last_error = e
+        finally:
+            response.close()
+
+    raise last_error
@@ -1,15 +1,22 @@
 import os
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from typing import List
+from typing import Iterator, Optional
 from .base import BaseFetcher
 from .models import Paper
 from .utils import generate_filename
 
 from ..converter import Converter
 
+IEEE_MAX_ROWS_PER_PAGE = 100  # Largest rowsPerPage accepted by /rest/search
+
 
 class IeeeFetcher(BaseFetcher):
+    source_name = "ieee"
+
     def __init__(self):
         super().__init__(search_delay=3.0, download_delay=20.0)
         self.base_url = "https://ieeexplore.ieee.org"
@@ -23,7 +30,23 @@ class IeeeFetcher(BaseFetcher):
         }
         self.converter = Converter()
 
-    def search(
+    def search_limit_url(self) -> Optional[str]:
+        return self.base_url
+
+    def download_limit_url(self, paper: Paper) -> Optional[str]:
+        return self.base_url
+
+    def _ensure_cookies(self):
+        """Fetch the IEEE session cookies once; they live on the pooled session."""
+        session = self._session(self.base_url)
+        if session.cookies:
+            return
+        try:
+            session.get(self.base_url, timeout=10)
+        except requests.exceptions.RequestException as e:
+            print(f"Warning: Failed to get initial cookies: {e}")
+
+    def iter_search(
         self,
         query: str,
         max_results: int = 10,
@@ -32,24 +55,23 @@ class IeeeFetcher(BaseFetcher):
         sort_order: str = "desc",
         start_year: int = None,
         end_year: int = None,
-    ) -> List[Paper]:
-        self._wait_for_search()
-        if max_results is None:
-            print(
-                "Warning: max_results is None. Recommend to set a safe upper bound for IEEE API."
-            )
+        **kwargs,
+    ) -> Iterator[Paper]:
+        """
+        Stream results page by page (walking `pageNumber`).
+        The next page is fetched in the background while the current one is being
+        consumed, as long as `totalRecords` says there is one and more results are
+        wanted. If the caller stops early, a prefetch that has not been sent yet
+        is cancelled.
+        max_results: None for all available records.
+        """
         # Get session cookies first
-        session = requests.Session()
-        try:
-            session.get(self.base_url, timeout=10)
-        except requests.exceptions.RequestException as e:
-            print(f"Warning: Failed to get initial cookies: {e}")
+        self._ensure_cookies()
 
         payload = {
             "queryText": query,
             "returnFacets": ["ALL"],
             "returnType": "SEARCH",
-            "rowsPerPage": max_results,
         }
 
         # Sorting
@@ -70,114 +92,175 @@ class IeeeFetcher(BaseFetcher):
         if open_access_only:
             payload["openAccess"] = "true"
 
+        rows = (
+            min(max_results, IEEE_MAX_ROWS_PER_PAGE)
+            if max_results
+            else IEEE_MAX_ROWS_PER_PAGE
+        )
+
+        data = self._fetch_page(payload, 1, rows)
+        if data is None:
+            return
+
+        total = data.get("totalRecords", 0) or 0
+        target = min(total, max_results) if max_results else total
+
+        yielded = 0
+        page = 1
+        cancelled = threading.Event()
+        prefetcher = ThreadPoolExecutor(max_workers=1)
         try:
-            response = session.post(
+            while data is not None:
+                records = data.get("records") or []
+                # Unparsable records don't count towards the target
+                papers = [
+                    paper
+                    for paper in map(self._parse_record, records)
+                    if paper is not None
+                ]
+
+                next_page = None
+                if records and yielded + len(papers) < target and page * rows < total:
+                    # Reserve the rate-limit slot here; the worker only sleeps it off
+                    delay = self._limiter("search", self.base_url).reserve()
+                    next_page = prefetcher.submit(
+                        self._fetch_page, payload, page + 1, rows, delay, cancelled
+                    )
+
+                for paper in papers[: target - yielded]:
+                    yield paper
+                    yielded += 1
+
+                if next_page is None:
+                    break
+                data = next_page.result()
+                page += 1
+        finally:
+            # Stopped early (break, generator close) or done: don't send a pending page
+            cancelled.set()
+            prefetcher.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_page(
+        self,
+        payload: dict,
+        page: int,
+        rows: int,
+        delay: float = None,
+        cancelled: Optional[threading.Event] = None,
+    ) -> Optional[dict]:
+        """
+        POST one page of a search. The first page waits for the search limiter itself;
+        prefetched pages pass the `delay` reserved for them by the caller, and are
+        dropped (None) if `cancelled` is set before the request goes out.
+        """
+        page_payload = dict(payload, rowsPerPage=rows, pageNumber=page)
+        if cancelled is not None:
+            if cancelled.wait(delay or 0):
+                return None
+        elif delay:
+            time.sleep(delay)
+
+        try:
+            response = self._request(
+                "POST",
                 f"{self.base_url}/rest/search",
                 headers=self.headers,
-                json=payload,
+                json=page_payload,
                 timeout=20,
+                rate_limit="search" if delay is None else None,
+                cache=True,
             )
             response.raise_for_status()
-            data = response.json()
+            return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Error querying IEEE API: {e}")
-            return []
+            print(f"Error querying IEEE API (page {page}): {e}")
+            return None
 
-        results = []
-        if "records" in data:
-            for item in data["records"]:
+    def _parse_record(self, item: dict) -> Optional[Paper]:
+        """Convert one `/rest/search` record into a Paper."""
+        try:
+            title = item.get("articleTitle", "")
+
+            # Authors
+            authors = []
+            if "authors" in item:
+                for auth in item["authors"]:
+                    if "preferredName" in auth:
+                        authors.append(auth["preferredName"])
+                    elif "normalizedName" in auth:
+                        authors.append(auth["normalizedName"])
+
+            abstract = item.get("abstract", "")
+
+            # URL & ID
+            arnumber = item.get("articleNumber", "")
+            url = f"{self.base_url}/document/{arnumber}/"
+
+            # PDF URL
+            # The API returns "pdfLink": "/stamp/stamp.jsp?tp=&arnumber=..."
+            pdf_link = item.get("pdfLink", "")
+            pdf_url = ""
+            if pdf_link:
+                pdf_url = self.base_url + pdf_link
+
+            # Year
+            year = item.get("publicationYear")
+            published_date = None
+            if year:
                 try:
-                    title = item.get("articleTitle", "")
-
-                    # Authors
-                    authors = []
-                    if "authors" in item:
-                        for auth in item["authors"]:
-                            if "preferredName" in auth:
-                                authors.append(auth["preferredName"])
-                            elif "normalizedName" in auth:
-                                authors.append(auth["normalizedName"])
-
-                    abstract = item.get("abstract", "")
-
-                    # URL & ID
-                    arnumber = item.get("articleNumber", "")
-                    url = f"{self.base_url}/document/{arnumber}/"
-
-                    # PDF URL
-                    # The API returns "pdfLink": "/stamp/stamp.jsp?tp=&arnumber=..."
-                    pdf_link = item.get("pdfLink", "")
-                    pdf_url = ""
-                    if pdf_link:
-                        pdf_url = self.base_url + pdf_link
-
-                    # Year
-                    year = item.get("publicationYear")
-                    published_date = None
-                    if year:
-                        try:
-                            published_date = date(int(year), 1, 1)
-                        except ValueError:
-                            pass
-
-                    # Access Status
-                    # accessType can be a string or a dict: {'type': 'locked', ...}
-                    access_type_val = item.get("accessType")
-                    is_downloadable = False
-
-                    if isinstance(access_type_val, dict):
-                        # e.g. {'type': 'locked', ...} or {'type': 'open-access', ...}
-                        type_str = (
-                            access_type_val.get("type", "").upper().replace("-", "_")
-                        )
-                        if type_str in ["OPEN_ACCESS", "EPHEMERA"]:
-                            is_downloadable = True
-                    elif isinstance(access_type_val, str):
-                        if access_type_val.upper().replace("-", "_") in [
-                            "OPEN_ACCESS",
-                            "EPHEMERA",
-                        ]:
-                            is_downloadable = True
-
-                    # If PDF link is available, consider it downloadable (e.g. via IP auth)
-                    if pdf_link:
-                        is_downloadable = True
-
-                    # If it's None or unknown, default to False (safe) or True (optimistic)?
-                    # Given the user wants to filter, safe (False) is better,
-                    # but if we want to show "Restricted?" we can leave it False.
-                    # The CLI shows [Downloadable] if True.
-
-                    # Remove debug print
-                    # print(f"DEBUG: Title='{title[:20]}...', accessType='{access_type_val}'")
-
-                    paper = Paper(
-                        source="ieee",
-                        id=arnumber,
-                        title=title,
-                        authors=authors,
-                        abstract=abstract,
-                        url=url,
-                        pdf_url=pdf_url,
-                        published_date=published_date,
-                        is_downloadable=is_downloadable,
-                    )
-                    results.append(paper)
-                except Exception as e:
-                    print(f"Error parsing item: {e}")
-                    continue
-
-        return results
+                    published_date = date(int(year), 1, 1)
+                except ValueError:
+                    pass
+
+            # Access Status
+            # accessType can be a string or a dict: {'type': 'locked', ...}
+            access_type_val = item.get("accessType")
+            is_downloadable = False
+
+            if isinstance(access_type_val, dict):
+                # e.g. {'type': 'locked', ...} or {'type': 'open-access', ...}
+                type_str = access_type_val.get("type", "").upper().replace("-", "_")
+                if type_str in ["OPEN_ACCESS", "EPHEMERA"]:
+                    is_downloadable = True
+            elif isinstance(access_type_val, str):
+                if access_type_val.upper().replace("-", "_") in [
+                    "OPEN_ACCESS",
+                    "EPHEMERA",
+                ]:
+                    is_downloadable = True
+
+            # If PDF link is available, consider it downloadable (e.g. via IP auth)
+            if pdf_link:
+                is_downloadable = True
+
+            # If it's None or unknown, default to False (safe) or True (optimistic)?
+            # Given the user wants to filter, safe (False) is better,
+            # but if we want to show "Restricted?" we can leave it False.
+            # The CLI shows [Downloadable] if True.
+
+            # Remove debug print
+            # print(f"DEBUG: Title='{title[:20]}...', accessType='{access_type_val}'")
+
+            paper = Paper(
+                source="ieee",
+                id=arnumber,
+                title=title,
+                authors=authors,
+                abstract=abstract,
+                url=url,
+                pdf_url=pdf_url,
+                published_date=published_date,
+                is_downloadable=is_downloadable,
+            )
+            return paper
+        except Exception as e:
+            print(f"Error parsing item: {e}")
+            return None
 
     def get_total_results(
         self, query: str, start_year: int = None, end_year: int = None, **kwargs
     ) -> int:
-        self._wait_for_search()
-        session = requests.Session()
-        try:
-            session.get(self.base_url, timeout=10)
-        except Exception:
-            pass
+        self._ensure_cookies()
 
         payload = {
             "queryText": query,
@@ -195,11 +278,14 @@ class IeeeFetcher(BaseFetcher):
             payload["openAccess"] = "true"
 
         try:
-            response = session.post(
+            response = self._request(
+                "POST",
                 f"{self.base_url}/rest/search",
                 headers=self.headers,
                 json=payload,
                 timeout=20,
+                rate_limit="search",
+                cache=True,
             )
             response.raise_for_status()
             data = response.json()
@@ -216,7 +302,7 @@ class IeeeFetcher(BaseFetcher):
         method: str = "default",
         **kwargs,
     ) -> str:
-        self._wait_for_download()
+        self._wait_for_download(self.download_limit_url(paper))
         if not os.path.exists(save_dir):
             os.makedirs(save_dir)
 
@@ -232,25 +318,19 @@ class IeeeFetcher(BaseFetcher):
                 download_url = (
                     f"{self.base_url}/stampPDF/getPDF.jsp?tp=&arnumber={paper.id}"
                 )
-                response = requests.get(
-                    download_url, headers=self.headers, stream=True, timeout=30
+                # Rejects HTML pages (login/error) instead of saving them as PDF
+                self._download_file(
+                    download_url,
+                    filepath,
+                    headers=self.headers,
+                    timeout=30,
+                    content_type="application/pdf",
                 )
 
-                # Check if we got a PDF or an HTML page (login/error)
-                content_type = response.headers.get("Content-Type", "")
-                if "application/pdf" in content_type:
-                    with open(filepath, "wb") as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
+                if convert_to_md:
+                    self.converter.convert_to_markdown(filepath, save_dir)
 
-                    if convert_to_md:
-                        self.converter.convert_to_markdown(filepath, save_dir)
-
-                    return filepath
-                else:
-                    raise Exception(
-                        f"Failed to download PDF. Content-Type: {content_type}"
-                    )
+                return self._record_download(paper, filepath)
             else:
                 raise Exception("Paper ID is missing")
         except Exception as e:
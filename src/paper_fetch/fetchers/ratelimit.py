@@ -0,0 +1,142 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+# Upper bound for the adaptive slow-down applied after 429/503 responses
+MAX_SLOWDOWN = 8.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket measured in seconds of credit.
+
+    Credit refills at one second per second up to `(burst - 1)` average intervals.
+    Each slot costs a random interval drawn from `wait_range` (scaled by the current
+    slow-down factor), so the sustained rate is one call per average interval while
+    up to `burst` calls can go out back-to-back. A slot may be reserved while the
+    bucket is in debt; the caller then has to wait until the debt is repaid.
+    """
+
+    def __init__(self, wait_range: Tuple[float, float], burst: int = 1):
+        self._lock = threading.Lock()
+        self.configure(wait_range, burst)
+        self._credit = self._capacity
+        self._updated = time.monotonic()
+        self.slowdown = 1.0
+
+    def configure(self, wait_range: Tuple[float, float], burst: int = 1):
+        """Update the interval range and burst size (e.g. after config changes)."""
+        low, high = float(wait_range[0]), float(wait_range[1])
+        if high < low:
+            low, high = high, low
+        with self._lock:
+            self.wait_range = (low, high)
+            self.burst = max(1, int(burst))
+            self._capacity = (self.burst - 1) * (low + high) / 2
+
+    def _refill(self, now: float):
+        self._credit = min(self._capacity, self._credit + (now - self._updated))
+        self._updated = now
+
+    def next_slot(self) -> float:
+        """Seconds until the next call may proceed. Does not consume a slot."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, -self._credit)
+
+    def reserve(self) -> float:
+        """
+        Reserve the next slot without blocking.
+        Returns the number of seconds the caller must wait before using it.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            delay = max(0.0, -self._credit)
+            self._credit -= random.uniform(*self.wait_range) * self.slowdown
+            return delay
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """Slow down after a 429/503 response, honouring Retry-After if given."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.slowdown = min(MAX_SLOWDOWN, self.slowdown * 2)
+            if retry_after is None:
+                retry_after = self.wait_range[1] * self.slowdown
+            self._credit = min(self._credit, -retry_after)
+
+    def reward(self):
+        """Gradually return to the configured rate after successful responses."""
+        with self._lock:
+            if self.slowdown > 1.0:
+                self.slowdown = max(1.0, self.slowdown * 0.75)
+
+
+# Process-wide buckets keyed by (source, host, kind), shared by all fetcher instances
+_buckets: Dict[Tuple[str, str, str], TokenBucket] = {}
+_lock = threading.Lock()
+
+
+def get_limiter(
+    source: str, host: str, kind: str, wait_range: Tuple[float, float], burst: int = 1
+) -> TokenBucket:
+    """Return the shared bucket for a source/host/kind ("search" or "download")."""
+    key = (source, host, kind)
+    with _lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(wait_range, burst)
+            _buckets[key] = bucket
+        else:
+            bucket.configure(wait_range, burst)
+        return bucket
+
+
+# Limiter whose next slot the caller of this thread already reserved and waited for
+_prepaid = threading.local()
+
+
+@contextmanager
+def prepaid_slot(limiter: Optional[TokenBucket]) -> Iterator[None]:
+    """
+    Mark one slot of `limiter` as already reserved and waited for (e.g. on an
+    asyncio loop): the first rate-limit wait on that limiter in this thread is
+    skipped instead of reserving another slot.
+    """
+    previous = getattr(_prepaid, "limiter", None)
+    _prepaid.limiter = limiter
+    try:
+        yield
+    finally:
+        _prepaid.limiter = previous
+
+
+def take_prepaid(limiter: TokenBucket) -> bool:
+    """Consume the prepaid slot if it belongs to `limiter` (only one call is covered)."""
+    if getattr(_prepaid, "limiter", None) is limiter:
+        _prepaid.limiter = None
+        return True
+    return False
+
+
+def report_status(source: str, host: str, status_code: int, retry_after=None):
+    """Feed a response status into every bucket of the source/host (adaptive slow-down)."""
+    with _lock:
+        buckets = [b for k, b in _buckets.items() if k[0] == source and k[1] == host]
+
+    for bucket in buckets:
+        if status_code in (429, 503):
+            bucket.penalize(_parse_retry_after(retry_after))
+        elif status_code < 400:
+            bucket.reward()
+
+
+def _parse_retry_after(value) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP-date values are ignored)."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
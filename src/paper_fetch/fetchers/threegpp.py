@@ -1,26 +1,32 @@
 import os
 import re
-import requests
 import logging
 import shutil
-from typing import List
+from typing import Iterator
 from urllib.parse import unquote, urljoin
 
 from .base import BaseFetcher
 from .models import Paper
+from ..conversion import deferring, get_conversion_pool, when_all
 from ..converter import Converter
 
 logger = logging.getLogger(__name__)
 
+OFFICE_EXTENSIONS = (".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx")
+
 
 class ThreeGPPFetcher(BaseFetcher):
+    source_name = "3gpp"
+
     def __init__(self):
         super().__init__(
             search_delay=1.0, download_delay=1.0
         )  # 3GPP FTP might not need strict rate limiting, but good to have
         self.converter = Converter()
 
-    def search(self, query: str, max_results: int = 10, **kwargs) -> List[Paper]:
+    def iter_search(
+        self, query: str, max_results: int = 10, **kwargs
+    ) -> Iterator[Paper]:
         """
         Search for files in a 3GPP directory URL.
         'query' is expected to be a URL.
@@ -30,15 +36,15 @@ class ThreeGPPFetcher(BaseFetcher):
             # If not a URL, maybe we can support a default or error out.
             # For now, assume it must be a URL as per plan.
             logger.warning("Query is not a URL. Returning empty list.")
-            return []
+            return
 
         try:
-            response = requests.get(url, timeout=10)
+            response = self._request("GET", url, timeout=10, cache=True)
             response.raise_for_status()
             html_content = response.text
         except Exception as e:
             logger.error(f"Failed to fetch URL {url}: {e}")
-            return []
+            return
 
         # Parse HTML to find file links
         # Pattern to match: <a class="file" href="..."> or just href ending in .zip/.doc/.docx
@@ -51,7 +57,7 @@ class ThreeGPPFetcher(BaseFetcher):
         # We look for href="filename"
         # We filter for common document extensions
 
-        papers = []
+        count = 0
 
         # Simple regex for hrefs.
         # 3GPP directory listings usually have simple filenames in hrefs.
@@ -97,15 +103,15 @@ class ThreeGPPFetcher(BaseFetcher):
                     published_date=None,
                     is_downloadable=True,
                 )
-                papers.append(paper)
-
-        # Apply limit
-        if max_results:
-            papers = papers[:max_results]
+                yield paper
 
-        return papers
+                # Apply limit
+                count += 1
+                if max_results and count >= max_results:
+                    return
 
-    def _get_folder_name_from_url(self, url: str) -> str:
+    @staticmethod
+    def _get_folder_name_from_url(url: str) -> str:
         """
         Extract a meaningful folder name from the 3GPP URL.
         Examples:
@@ -129,13 +135,14 @@ class ThreeGPPFetcher(BaseFetcher):
         # Fallback: Use the last part
         return parts[-1]
 
-    def get_query_dirname(self, query: str) -> str:
+    @classmethod
+    def get_query_dirname(cls, query: str) -> str:
         """
         Override to provide meaningful folder name from URL.
         """
         # If query is a URL, use the helper
         if query.startswith("http"):
-            return self._get_folder_name_from_url(query)
+            return cls._get_folder_name_from_url(query)
 
         # Otherwise fallback to default sanitization
         return super().get_query_dirname(query)
@@ -202,134 +209,105 @@ class ThreeGPPFetcher(BaseFetcher):
         # Download file
         try:
             logger.info(f"Downloading {paper.url}...")
-            response = requests.get(paper.url, stream=True, timeout=30)
-            response.raise_for_status()
-            with open(local_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            self._download_file(paper.url, local_path, timeout=30)
         except Exception as e:
             logger.error(f"Download failed: {e}")
             raise e
 
         final_pdf_path = ""
+        # Where the downloaded file ends up (moved to archive/ or source/ below)
+        stored_path = local_path
+        # PDF/Markdown conversions run on the shared pool while the next
+        # download proceeds; each future resolves to the generated PDF (or None)
+        pool = get_conversion_pool()
+        conversions = []
 
         # Process based on extension
         if filename.lower().endswith(".zip"):
-            # Extract
-            # We extract to a temp dir first to see what's inside
-            import tempfile
-
-            with tempfile.TemporaryDirectory() as temp_extract_dir:
-                success = self.converter.extract_zip(local_path, temp_extract_dir)
-                if success:
-                    # Move ZIP to archive
-                    shutil.move(local_path, os.path.join(archive_dir, filename))
-
-                    # Process extracted files
-                    found_office_file = False
-                    for root, _, files in os.walk(temp_extract_dir):
-                        for file in files:
-                            # Skip macOS metadata
-                            if file.startswith("._") or "__MACOSX" in root:
-                                continue
-
-                            file_path = os.path.join(root, file)
-                            ext = os.path.splitext(file)[1].lower()
-
-                            if ext in [
-                                ".doc",
-                                ".docx",
-                                ".ppt",
-                                ".pptx",
-                                ".xls",
-                                ".xlsx",
-                            ]:
-                                found_office_file = True
-                                # Move to source dir
-                                # We might want to rename it to match zip name if needed,
-                                # but keeping original name is safer for now unless we want strict mapping.
-                                # The script did: zip_basename + "_" + office_filename
-
-                                zip_basename = os.path.splitext(filename)[0]
-                                new_filename = f"{zip_basename}_{file}"
-                                dest_source_path = os.path.join(
-                                    source_dir, new_filename
+            zip_basename = os.path.splitext(filename)[0]
+            found_office_file = False
+
+            def select_members(names):
+                """Office files go to source/, or PDFs if the archive has no Office file."""
+                nonlocal found_office_file
+                # Skip macOS metadata
+                names = [
+                    name
+                    for name in names
+                    if "__MACOSX" not in name
+                    and not os.path.basename(name).startswith("._")
+                ]
+                office = [
+                    name
+                    for name in names
+                    if os.path.splitext(name)[1].lower() in OFFICE_EXTENSIONS
+                ]
+                if office:
+                    found_office_file = True
+                    # The script did: zip_basename + "_" + office_filename
+                    return {
+                        name: os.path.join(
+                            source_dir, f"{zip_basename}_{os.path.basename(name)}"
+                        )
+                        for name in office
+                    }
+
+                # If PDFs found, they go to the PDF dir (or source if no PDFs are wanted)
+                target_dir = pdf_dir if convert_to_pdf else source_dir
+                return {
+                    name: os.path.join(target_dir, os.path.basename(name))
+                    for name in names
+                    if name.lower().endswith(".pdf")
+                }
+
+            # Members are streamed straight to their final paths
+            extracted = self.converter.extract_zip_members(local_path, select_members)
+            if extracted is not None:
+                # Move ZIP to archive
+                stored_path = os.path.join(archive_dir, filename)
+                shutil.move(local_path, stored_path)
+
+                if not found_office_file:
+                    logger.warning(f"No office files found in {filename}")
+
+                for path in extracted.values():
+                    if found_office_file:
+                        # Convert to PDF / Markdown (Optional)
+                        if convert_to_pdf or convert_to_md:
+                            conversions.append(
+                                pool.submit(
+                                    path,
+                                    pdf_dir if convert_to_pdf else None,
+                                    md_dir if convert_to_md else None,
                                 )
-                                shutil.copy2(file_path, dest_source_path)
-
-                                # Convert to PDF
-                                if convert_to_pdf:
-                                    pdf_path = self.converter.convert_to_pdf(
-                                        dest_source_path, pdf_dir
-                                    )
-                                    if pdf_path:
-                                        final_pdf_path = pdf_path
-
-                                # Convert to Markdown (Optional)
-                                if convert_to_md:
-                                    self.converter.convert_to_markdown(
-                                        dest_source_path, md_dir
-                                    )
-
-                    if not found_office_file:
-                        logger.warning(f"No office files found in {filename}")
-                        # If no office file, maybe it was just PDFs?
-                        # If PDFs found, move them to pdf_dir
-                        for root, _, files in os.walk(temp_extract_dir):
-                            for file in files:
-                                if file.lower().endswith(
-                                    ".pdf"
-                                ) and not file.startswith("._"):
-                                    # If it's a PDF, we treat it as source AND pdf?
-                                    # Or just put in PDF dir?
-                                    # If convert_to_pdf is False, maybe we still want it in source?
-                                    # But usually PDF is the target.
-                                    # Let's put it in PDF dir if convert_to_pdf is True, or if it's the only thing.
-                                    # Actually, if it's a PDF, it IS the source format too.
-                                    # Let's copy to source AND pdf (if enabled).
-
-                                    # Copy to source as well?
-                                    # The script might have just put it in PDF dir.
-                                    # Let's put it in PDF dir.
-                                    extracted_pdf_path = os.path.join(root, file)
-                                    if convert_to_pdf:
-                                        if not os.path.exists(pdf_dir):
-                                            os.makedirs(pdf_dir)
-                                        shutil.copy2(
-                                            extracted_pdf_path,
-                                            os.path.join(pdf_dir, file),
-                                        )
-                                        if not final_pdf_path:
-                                            final_pdf_path = os.path.join(pdf_dir, file)
-
-                                    # Also convert to MD if requested
-                                    if convert_to_md:
-                                        self.converter.convert_to_markdown(
-                                            extracted_pdf_path, md_dir
-                                        )
-
-                else:
-                    logger.error(f"Failed to extract {filename}")
-                    # Move to archive anyway? Or leave it?
-                    # Leave it for retry or manual inspection
-                    pass
-
-        elif filename.lower().endswith(
-            (".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx")
-        ):
+                            )
+                    else:
+                        if convert_to_pdf and not final_pdf_path:
+                            final_pdf_path = path
+
+                        # Also convert to MD if requested
+                        if convert_to_md:
+                            conversions.append(pool.submit(path, md_dir=md_dir))
+            else:
+                logger.error(f"Failed to extract {filename}")
+                # Leave it for retry or manual inspection
+
+        elif filename.lower().endswith(OFFICE_EXTENSIONS):
             # Direct office file
             # Move to source
             dest_source_path = os.path.join(source_dir, filename)
             shutil.move(local_path, dest_source_path)
+            stored_path = dest_source_path
 
             # Convert
-            if convert_to_pdf:
-                pdf_path = self.converter.convert_to_pdf(dest_source_path, pdf_dir)
-                if pdf_path:
-                    final_pdf_path = pdf_path
-
-            if convert_to_md:
-                self.converter.convert_to_markdown(dest_source_path, md_dir)
+            if convert_to_pdf or convert_to_md:
+                conversions.append(
+                    pool.submit(
+                        dest_source_path,
+                        pdf_dir if convert_to_pdf else None,
+                        md_dir if convert_to_md else None,
+                    )
+                )
 
         elif filename.lower().endswith(".pdf"):
             # Direct PDF
@@ -356,20 +334,29 @@ class ThreeGPPFetcher(BaseFetcher):
             if convert_to_md:
                 # We need the path to the file.
                 input_path = final_pdf_path
-                self.converter.convert_to_markdown(input_path, md_dir)
+                conversions.append(pool.submit(input_path, md_dir=md_dir))
 
         else:
             # Other files
             # Move to source or a 'others' dir?
             # Let's put in source for now
-            shutil.move(local_path, os.path.join(source_dir, filename))
-
-        # Return the path to the PDF if generated, else the source file
-        return (
-            final_pdf_path
-            if final_pdf_path
-            else os.path.join(target_base_dir, filename)
-        )
+            stored_path = os.path.join(source_dir, filename)
+            shutil.move(local_path, stored_path)
+
+        # Return the path to the PDF if generated, else the downloaded file
+        result_path = final_pdf_path or stored_path
+        if not conversions:
+            return self._record_download(paper, result_path)
+
+        def finish(pdf_paths):
+            converted = [path for path in pdf_paths if path]
+            return self._record_download(
+                paper, converted[-1] if converted else result_path
+            )
+
+        result = when_all(conversions, finish)
+        # Inside a DownloadEngine the conversions finish in the background
+        return result if deferring() else result.result()
 
     def get_total_results(self, query: str, **kwargs) -> int:
         # For 3GPP, we can just fetch and count
@@ -1,19 +1,31 @@
 import os
 import requests
 import json
-from typing import List
+from typing import Iterator, List, Optional
 from datetime import datetime
 from bs4 import BeautifulSoup
 from .base import BaseFetcher
 from .models import Paper
 from .utils import generate_filename
 
+USPTO_MAX_PAGE_SIZE = 1000  # Largest page size accepted by the PatentSearch API
+DEFAULT_FIELDS = [
+    "patent_number",
+    "patent_title",
+    "patent_abstract",
+    "patent_date",
+    "inventors",
+    "patent_kind",
+]
+
 
 class UsptoFetcher(BaseFetcher):
     """
     USPTO PatentsView API Fetcher.
     """
 
+    source_name = "uspto"
+
     supports_download_methods = True
     available_download_methods = ["Google Patents", "USPTO Direct"]
 
@@ -24,8 +36,16 @@ class UsptoFetcher(BaseFetcher):
         self.api_url = "https://search.patentsview.org/api/v1/patent/query/"
         # API Key is optional for basic use but recommended for higher limits.
         self.api_key = self.config.get("api_keys", {}).get("uspto")
+        # Fields requested from the API (projection)
+        self.fields = self.config.get("uspto", {}).get("fields") or DEFAULT_FIELDS
+
+    def search_limit_url(self) -> Optional[str]:
+        return self.api_url
 
-    def search(
+    def download_limit_url(self, paper: Paper) -> Optional[str]:
+        return paper.url
+
+    def iter_search(
         self,
         query: str,
         max_results: int = 10,
@@ -33,9 +53,15 @@ class UsptoFetcher(BaseFetcher):
         sort_order: str = "desc",
         start_year: int = None,
         end_year: int = None,
-    ) -> List[Paper]:
-        self._wait_for_search()
-
+        fields: List[str] = None,
+        **kwargs,
+    ) -> Iterator[Paper]:
+        """
+        Stream patents page by page using PatentsView cursor (`after`) pagination.
+        max_results: None for every matching patent.
+        fields: PatentsView fields to request (default: [uspto] fields in config).
+                Dropping heavy fields such as `patent_abstract` speeds up bulk harvests.
+        """
         # Build PatentsView Query
         # We search in title or abstract
         # Reference: https://patentsview.org/apis/search/query
@@ -57,40 +83,72 @@ class UsptoFetcher(BaseFetcher):
             if date_criteria:
                 q_obj = {"_and": [q_obj] + date_criteria}
 
-        params = {
-            "q": json.dumps(q_obj),
-            "f": json.dumps(
-                [
-                    "patent_number",
-                    "patent_title",
-                    "patent_abstract",
-                    "patent_date",
-                    "inventors",
-                    "patent_kind",
-                ]
-            ),
-            "o": json.dumps({"per_page": max_results}),
-        }
-
         # Sorting
         # PatentsView sort fields: https://patentsview.org/apis/search/sort
-        # Default is usually patent_number? relevance is not strictly supported by API except via text score,
-        # but the API doesn't expose strict "relevance" sort param easily in this wrapper.
-        # We will use patent_date if requested, otherwise let API default (often patent_number).
+        # Relevance is not exposed by the API, so it falls back to patent number order.
+        # The cursor needs a total order, so patent_number is always the last sort key.
+        sort = []
         if sort_by == "date":
-            # API expects "s": [{"patent_date": "desc"}]
             direction = "desc" if sort_order == "desc" else "asc"
-            params["s"] = json.dumps([{"patent_date": direction}])
+            sort.append({"patent_date": direction})
+        sort.append({"patent_number": "asc"})
+        sort_keys = [next(iter(s)) for s in sort]
+
+        fields = list(fields or self.fields)
+        for key in sort_keys:
+            if key not in fields:
+                fields.append(key)  # Needed to build the next cursor
 
         headers = {"Accept": "application/json"}
         if self.api_key:
             headers["X-Api-Key"] = self.api_key
 
+        page_size = min(max_results or USPTO_MAX_PAGE_SIZE, USPTO_MAX_PAGE_SIZE)
+        after = None
+        yielded = 0
+
+        while True:
+            options = {"size": page_size}
+            if after is not None:
+                options["after"] = after
+
+            params = {
+                "q": json.dumps(q_obj),
+                "f": json.dumps(fields),
+                "o": json.dumps(options),
+                "s": json.dumps(sort),
+            }
+            patents = self._fetch_page(params, headers)
+            if not patents:
+                return
+
+            for item in patents:
+                yield self._parse_patent(item)
+                yielded += 1
+                if max_results and yielded >= max_results:
+                    return
+
+            if len(patents) < page_size:
+                return  # Last page
+
+            last = patents[-1]
+            after = [last.get(key) for key in sort_keys]
+            if max_results:
+                page_size = min(page_size, max_results - yielded)
+
+    def _fetch_page(self, params: dict, headers: dict) -> List[dict]:
+        """POST one page of a PatentsView query and return its patents ([] on error)."""
         try:
             # POST is also supported and safer for long queries, but GET is standard for this API
             # We use POST to avoid URL length issues
-            response = requests.post(
-                self.api_url, json=params, headers=headers, timeout=30
+            response = self._request(
+                "POST",
+                self.api_url,
+                json=params,
+                headers=headers,
+                timeout=30,
+                rate_limit="search",
+                cache=True,
             )
             response.raise_for_status()
             data = response.json()
@@ -108,75 +166,71 @@ class UsptoFetcher(BaseFetcher):
             print(f"Error querying USPTO API: {e}")
             return []
 
-        results = []
-        patents = data.get("patents", [])
-        if not patents:
-            return []
+        return data.get("patents") or []
+
+    def _parse_patent(self, item: dict) -> Paper:
+        """Convert one PatentsView record into a Paper (missing fields get defaults)."""
+        title = item.get("patent_title", "No Title")
+        abstract = item.get("patent_abstract", "")
+        patent_number = item.get("patent_number", "")
+        patent_kind = item.get("patent_kind", "")
+
+        # Authors (Inventors)
+        inventors = []
+        for inv in item.get("inventors", []):
+            fname = inv.get("inventor_name_first", "")
+            lname = inv.get("inventor_name_last", "")
+            if fname or lname:
+                inventors.append(f"{fname} {lname}".strip())
+
+        # Date
+        pub_date_str = item.get("patent_date")
+        pub_date = None
+        if pub_date_str:
+            try:
+                pub_date = datetime.strptime(pub_date_str, "%Y-%m-%d").date()
+            except Exception:
+                pass
 
-        for item in patents:
-            title = item.get("patent_title", "No Title")
-            abstract = item.get("patent_abstract", "")
-            patent_number = item.get("patent_number", "")
-            patent_kind = item.get("patent_kind", "")
-
-            # Authors (Inventors)
-            inventors = []
-            for inv in item.get("inventors", []):
-                fname = inv.get("inventor_name_first", "")
-                lname = inv.get("inventor_name_last", "")
-                if fname or lname:
-                    inventors.append(f"{fname} {lname}".strip())
-
-            # Date
-            pub_date_str = item.get("patent_date")
-            pub_date = None
-            if pub_date_str:
-                try:
-                    pub_date = datetime.strptime(pub_date_str, "%Y-%m-%d").date()
-                except Exception:
-                    pass
-
-            # ID construction
-            # We store the raw number as ID, but for Google Patents we need US prefix and Kind
-            # But Kind is sometimes missing or complex.
-            # Base ID: patent_number
-
-            # Construct Google Patents URL for "View Online"
-            # Format: US<NUMBER><KIND> e.g. US1234567B2
-            # If kind is missing, Google often redirects correctly with just US + Number
-            gp_id = (
-                f"US{patent_number}{patent_kind}"
-                if patent_kind
-                else f"US{patent_number}"
-            )
-            url = f"https://patents.google.com/patent/{gp_id}/en"
-
-            paper = Paper(
-                source="uspto",
-                id=patent_number,  # Keep raw number as ID
-                title=title,
-                authors=inventors,
-                abstract=abstract,
-                url=url,
-                pdf_url="",  # Determined dynamically
-                published_date=pub_date,
-                is_downloadable=True,
-            )
-            # Store gp_id in paper object? Paper model is rigid.
-            # We can re-construct it in download method or use ID.
-            # Let's attach it to the object as a dynamic attribute for internal use not serialized?
-            # Or just recompute it. Recomputing is safer.
+        # ID construction
+        # We store the raw number as ID, but for Google Patents we need US prefix and Kind
+        # But Kind is sometimes missing or complex.
+        # Base ID: patent_number
 
-            results.append(paper)
+        # Construct Google Patents URL for "View Online"
+        # Format: US<NUMBER><KIND> e.g. US1234567B2
+        # If kind is missing, Google often redirects correctly with just US + Number
+        gp_id = (
+            f"US{patent_number}{patent_kind}" if patent_kind else f"US{patent_number}"
+        )
+        url = f"https://patents.google.com/patent/{gp_id}/en"
+
+        paper = Paper(
+            source="uspto",
+            id=patent_number,  # Keep raw number as ID
+            title=title,
+            authors=inventors,
+            abstract=abstract,
+            url=url,
+            pdf_url="",  # Determined dynamically
+            published_date=pub_date,
+            is_downloadable=True,
+        )
+        # Store gp_id in paper object? Paper model is rigid.
+        # We can re-construct it in download method or use ID.
+        # Let's attach it to the object as a dynamic attribute for internal use not serialized?
+        # Or just recompute it. Recomputing is safer.
 
-        return results
+        return paper
 
     def check_downloadable(self, paper: Paper, method: str = "default") -> bool:
         # Both methods assume we have a valid patent number.
         return bool(paper.id)
 
-    def download_pdf(self, paper: Paper, save_dir: str, method: str = "default") -> str:
-        self._wait_for_download()
+    def download_pdf(
+        self, paper: Paper, save_dir: str, method: str = "default", **kwargs
+    ) -> str:
+        self._wait_for_download(self.download_limit_url(paper))
         if not os.path.exists(save_dir):
             os.makedirs(save_dir)
 
@@ -186,10 +240,12 @@ class UsptoFetcher(BaseFetcher):
         filepath = os.path.join(save_dir, filename)
 
         if method == "USPTO Direct":
-            return self._download_direct(paper, filepath)
+            return self._record_download(paper, self._download_direct(paper, filepath))
         else:
             # Default: Google Patents
-            return self._download_google_patents(paper, filepath)
+            return self._record_download(
+                paper, self._download_google_patents(paper, filepath)
+            )
 
     def _download_direct(self, paper: Paper, filepath: str) -> str:
         # https://image-ppubs.uspto.gov/dirsearch-public/print/downloadPdf/#######
@@ -199,14 +255,8 @@ class UsptoFetcher(BaseFetcher):
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             }
-            r = requests.get(url, headers=headers, stream=True, timeout=60)
-            r.raise_for_status()
-
             # Check content type if possible, though USPTO API might just return raw stream
-            with open(filepath, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            return filepath
+            return self._download_file(url, filepath, headers=headers, timeout=60)
         except Exception as e:
             print(f"USPTO Direct download failed: {e}")
             raise e
@@ -222,7 +272,7 @@ class UsptoFetcher(BaseFetcher):
         }
 
         try:
-            r = requests.get(target_url, headers=headers, timeout=20)
+            r = self._request("GET", target_url, headers=headers, timeout=20)
             r.raise_for_status()
 
             soup = BeautifulSoup(r.text, "html.parser")
@@ -248,13 +298,7 @@ class UsptoFetcher(BaseFetcher):
                 raise ValueError("Could not find PDF link on Google Patents page.")
 
             # Download
-            pdf_r = requests.get(pdf_link, headers=headers, stream=True, timeout=60)
-            pdf_r.raise_for_status()
-
-            with open(filepath, "wb") as f:
-                for chunk in pdf_r.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            return filepath
+            return self._download_file(pdf_link, filepath, headers=headers, timeout=60)
 
         except Exception as e:
             print(f"Google Patents download failed: {e}")
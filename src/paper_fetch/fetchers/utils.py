@@ -1,6 +1,8 @@
+import json
+import os
 import re
 from datetime import date
-from typing import Optional
+from typing import Any, Dict, Optional
 
 def sanitize_filename(text: str) -> str:
     """Sanitize text for use in filenames."""
@@ -46,3 +48,34 @@ def generate_filename(paper_title: str, authors: list[str], published_date: Opti
 
     filename = "_".join(components)
     return f"{filename}.pdf"
+
+
+def load_checkpoint(path: str, signature: Dict[str, Any]) -> int:
+    """Return the saved offset if the checkpoint at `path` belongs to `signature`, else 0."""
+    if not os.path.exists(path):
+        return 0
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if data.get("signature") != signature:
+        return 0
+    return int(data.get("offset", 0))
+
+
+def save_checkpoint(path: str, signature: Dict[str, Any], offset: int):
+    """Atomically record the offset reached for a paged harvest."""
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"signature": signature, "offset": offset}, f)
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoint(path: str):
+    """Remove a checkpoint once its harvest has completed."""
+    if os.path.exists(path):
+        os.remove(path)
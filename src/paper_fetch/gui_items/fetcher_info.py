@@ -4,22 +4,39 @@ import sys
 # Add src to path to allow imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from paper_fetch.fetchers.arxiv import ArxivFetcher
-from paper_fetch.fetchers.ieee import IeeeFetcher
-from paper_fetch.fetchers.threegpp import ThreeGPPFetcher
-from paper_fetch.fetchers.uspto import UsptoFetcher
+import streamlit as st
+
+from paper_fetch.config import config_signature
+from paper_fetch.sources import create_fetcher
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_fetcher(source, config_key):
+    try:
+        return create_fetcher(source)
+    except ValueError:
+        return None
+
+
+# Config signature the cached fetchers were built with
+_built_with = None
 
 
 def get_fetcher(source):
-    if source == "arxiv":
-        return ArxivFetcher()
-    elif source == "ieee":
-        return IeeeFetcher()
-    elif source == "3gpp":
-        return ThreeGPPFetcher()
-    elif source == "uspto":
-        return UsptoFetcher()
-    return None
+    """
+    Return the fetcher for `source`, built once per GUI process.
+    The instance (and its sessions/limiters) survives reruns, so repeated
+    clicks don't reload config or re-probe converters, and politeness waits
+    carry over between actions. After config.toml changes the cached
+    fetchers are dropped and new ones are built from the new config.
+    """
+    global _built_with
+    signature = config_signature()
+    if signature != _built_with:
+        if _built_with is not None:
+            _cached_fetcher.clear()
+        _built_with = signature
+    return _cached_fetcher(source, signature)
 
 
 def get_search_hint(current_source_for_hint):
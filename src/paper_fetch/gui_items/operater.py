@@ -6,8 +6,11 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+from paper_fetch.downloader import DownloadTask
+from paper_fetch.fetchers.base import report_progress
 from paper_fetch.gui_items.fetcher_info import get_fetcher
 from paper_fetch.gui_items.state import save_state
+from paper_fetch.jobs import JobManager
 
 
 def check_hits():
@@ -85,34 +88,39 @@ def search_papers(
         else:
             progress_placeholder.empty()
 
-    fetcher.set_progress_callback(progress_callback)
-
-    # Check hits before searching
-    check_hits()
-
-    with st.spinner(f"Searching {source.upper()} for '{query}'..."):
+    # Check hits before searching. The fetcher is shared by all browser
+    # sessions, so the callback is bound to this thread, not set on the fetcher
+    with report_progress(progress_callback):
+        check_hits()
+
+    search_args = {
+        "max_results": limit,
+        "sort_by": sort_by,
+        "sort_order": sort_order,
+        "start_year": start_year,
+        "end_year": end_year,
+    }
+    if source == "ieee":
+        search_args["open_access_only"] = open_access_only
+
+    count_placeholder = st.empty()
+
+    with (
+        report_progress(progress_callback),
+        st.spinner(f"Searching {source.upper()} for '{query}'..."),
+    ):
         try:
-            if source == "ieee":
-                results = fetcher.search(
-                    query,
-                    max_results=limit,
-                    open_access_only=open_access_only,
-                    sort_by=sort_by,
-                    sort_order=sort_order,
-                    start_year=start_year,
-                    end_year=end_year,
-                )
-            else:
-                results = fetcher.search(
-                    query,
-                    max_results=limit,
-                    sort_by=sort_by,
-                    sort_order=sort_order,
-                    start_year=start_year,
-                    end_year=end_year,
-                )
+            # Show a running count while pages stream in
+            results = []
+            for paper in fetcher.iter_search(query, **search_args):
+                results.append(paper)
+                if len(results) % 10 == 0:
+                    count_placeholder.caption(f"Fetched {len(results)} papers...")
             st.session_state.results = results
             st.session_state.selected_papers = set()  # Reset selection on new search
+            st.session_state.results_page = 0
+            for key in [k for k in st.session_state if str(k).startswith("chk_")]:
+                del st.session_state[key]  # Checkbox states of the previous results
             # Reset filters on new search
             st.session_state.filter_keyword = ""
             st.session_state.filter_year_min = None
@@ -125,6 +133,7 @@ def search_papers(
             return []
         finally:
             progress_placeholder.empty()
+            count_placeholder.empty()
 
 
 def get_default_output_dir(query: str) -> str:
@@ -138,7 +147,18 @@ def get_default_output_dir(query: str) -> str:
     return os.path.join("downloads", f"{date_str}_{safe_query}")
 
 
+@st.cache_resource(show_spinner=False)
+def get_job_manager():
+    """Background download jobs for the GUI process; they keep running across reruns."""
+    return JobManager()
+
+
 def download_papers(papers, output_dir_base, source):
+    """
+    Queue the papers on a background download job and return the output directory.
+    Progress is shown by `download_progress_panel`, which polls the job state,
+    so the results list stays usable while the batch runs.
+    """
     fetcher = get_fetcher(source)
 
     # Determine final output directory logic
@@ -154,61 +174,84 @@ def download_papers(papers, output_dir_base, source):
     # Append source subdirectory
     final_output_dir = os.path.join(final_output_dir_base, source)
 
-    # Calculate total estimate
-    min_wait, max_wait = fetcher.get_download_wait_range()
-    total_min = min_wait * len(papers)
-    total_max = max_wait * len(papers)
+    # fetcher.download_pdf handles the directory creation
+    options = {"convert_to_md": st.session_state.convert_to_md}
+    if source == "3gpp":
+        # Pass convert_to_md and convert_to_pdf flags
+        options["convert_to_pdf"] = st.session_state.convert_to_pdf
+    else:
+        options["method"] = st.session_state.executed_download_method
 
-    # Progress placeholder for rate limit wait
-    progress_placeholder = st.empty()
+    tasks = [
+        DownloadTask(fetcher, paper, final_output_dir, options) for paper in papers
+    ]
+    st.session_state.download_job_id = get_job_manager().submit(tasks)
+    st.session_state.download_job_dir = final_output_dir
+    st.session_state.last_download_dir = final_output_dir
 
-    def progress_callback(msg):
-        if msg:
-            progress_placeholder.info(msg)
-        else:
-            progress_placeholder.empty()
+    save_state()
+    return final_output_dir
 
-    fetcher.set_progress_callback(progress_callback)
 
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+def _format_seconds(seconds):
+    if seconds is None:
+        return "estimating..."
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes}m {secs:02d}s" if minutes else f"{secs}s"
 
-    success_count = 0
-    total = len(papers)
 
-    st.info(f"Downloading to: {final_output_dir}")
-    st.caption(
-        f"Estimated total wait time: {total_min/60:.1f} - {total_max/60:.1f} minutes (Rate limit: {min_wait:.1f}-{max_wait:.1f}s/file)"
-    )
+@st.fragment(run_every=1.0)
+def download_progress_panel():
+    """Live progress of the current background download job (polled every second)."""
+    job_id = st.session_state.get("download_job_id")
+    job = get_job_manager().get(job_id) if job_id else None
+    if job is None:
+        return
 
-    for i, paper in enumerate(papers):
-        status_text.text(f"Downloading {i+1}/{total}: {paper.title[:50]}...")
-        try:
-            # fetcher.download_pdf handles the directory creation
-            if source == "3gpp":
-                # Pass convert_to_md and convert_to_pdf flags
-                fetcher.download_pdf(
-                    paper,
-                    final_output_dir,
-                    convert_to_md=st.session_state.convert_to_md,
-                    convert_to_pdf=st.session_state.convert_to_pdf,
-                )
-            else:
-                # Arxiv and IEEE now support convert_to_md
-                fetcher.download_pdf(
-                    paper,
-                    final_output_dir,
-                    convert_to_md=st.session_state.convert_to_md,
-                    method=st.session_state.executed_download_method,  # Pass method
-                )
-            success_count += 1
-        except Exception as e:
-            st.error(f"Failed to download '{paper.title}': {e}")
+    status = job.to_dict(with_items=False)
+    counts = status["counts"]
+    completed = counts.get("done", 0) + counts.get("failed", 0)
+    total = status["total"]
 
-        progress_bar.progress((i + 1) / total)
+    st.info(f"Downloading to: {st.session_state.get('download_job_dir', '')}")
+    st.progress(completed / total if total else 1.0)
 
-    status_text.text(f"Completed! Downloaded {success_count}/{total} papers.")
-    st.success(f"Downloaded {success_count} papers to {final_output_dir}")
-    st.success(f"Downloaded {success_count} papers to {final_output_dir}")
-    save_state()
-    return final_output_dir
+    active = [item for item in job.items if item.status in ("waiting", "downloading")]
+    if not job.done:
+        for item in active:
+            if item.status == "waiting":
+                st.caption(f"⏳ Waiting (rate limit): {item.paper.title[:60]}")
+            else:
+                size = f"{item.received / 1e6:.1f}"
+                if item.total:
+                    size += f"/{item.total / 1e6:.1f}"
+                st.caption(f"⬇️ {item.paper.title[:60]} ({size} MB)")
+
+        col_status, col_cancel = st.columns([4, 1], vertical_alignment="center")
+        with col_status:
+            st.caption(
+                f"{completed}/{total} done · {status['bytes'] / 1e6:.1f} MB · "
+                f"ETA {_format_seconds(status['eta'])}"
+            )
+        with col_cancel:
+            if st.button("Cancel", key=f"cancel_{job.id}", use_container_width=True):
+                get_job_manager().cancel(job.id)
+        return
+
+    for item in job.items:
+        if item.status == "failed":
+            st.error(f"Failed to download '{item.paper.title}': {item.error}")
+
+    success_count = counts.get("done", 0)
+    if job.cancelled:
+        st.warning(f"Cancelled. Downloaded {success_count}/{total} papers.")
+    else:
+        st.success(
+            f"Completed! Downloaded {success_count}/{total} papers. "
+            "Click 'Export Mode' to process further."
+        )
+
+    # Refresh the whole page once so "Downloaded" badges pick up the new files
+    if st.session_state.get("download_job_refreshed") != job.id:
+        st.session_state.download_job_refreshed = job.id
+        st.rerun(scope="app")
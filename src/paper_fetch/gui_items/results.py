@@ -1,13 +1,16 @@
 import streamlit as st
 from paper_fetch.gui_items.fetcher_info import get_fetcher
-from paper_fetch.gui_items.operater import download_papers
+from paper_fetch.gui_items.operater import download_papers, download_progress_panel
 from paper_fetch.gui_items.style import inject_sticky_header_css
 import os
 import shutil
 from paper_fetch.exporters.notebooklm import upload_to_notebooklm
-from paper_fetch.fetchers.utils import generate_filename
+from paper_fetch.library import get_library
 from paper_fetch.gui_items.operater import get_default_output_dir
 
+# Choices for the results page size selector
+PAGE_SIZE_OPTIONS = [25, 50, 100, 200]
+
 
 def results_panel():
     # Helper to switch modes
@@ -336,20 +339,16 @@ def results_list_view(go_to_export_callback):
                     st.warning(f"Limit exceeded. Truncating to {int(dl_limit)}.")
                     papers_to_download = papers_to_download[: int(dl_limit)]
 
-                final_out_dir = download_papers(
+                download_papers(
                     papers_to_download, out_dir, st.session_state.executed_source
                 )
-                if final_out_dir:
-                    st.session_state.last_download_dir = final_out_dir
-                    # Auto switch to export mode on successful download?
-                    # User didn't explicitly ask to auto-switch, but said "button to go there".
-                    # Let's show a toast or just let user click.
-                    st.success(
-                        "Download Complete! Click 'Export Mode' to process further."
-                    )
+                st.toast("Download started in the background.")
             else:
                 st.warning("No papers selected.")
 
+        # Background download progress (keeps updating while the list is used)
+        download_progress_panel()
+
         # Filter Section (Rest of the code remains similar)
         col_f1, col_f2, col_f3, col_show_dl_only = st.columns(
             [2, 1, 1, 1], vertical_alignment="bottom"
@@ -402,44 +401,6 @@ def results_list_view(go_to_export_callback):
                 p for p in display_results if fetcher.check_downloadable(p, method)
             ]
 
-        # Determine current effective output directory to check for downloaded files
-        # Consolidate logic for where files are expected to be
-        current_query = st.session_state.executed_query
-        target_dir_base = st.session_state.executed_save_dir
-
-        if target_dir_base == "downloads":
-            # If default, it uses the query-based folder
-            # However, executed_save_dir might just be 'downloads' string in session state
-            # but actual download happened to specific folder.
-            # If we rely on get_default_output_dir(current_query), it might mismatch if date changed?
-            # Actually, `get_default_output_dir` uses today's date.
-            # If I search yesterday and reload today, the date changes.
-            # Ideally `executed_save_dir` should store the FULL path if it was auto-generated?
-            # But currently it stores what's in the text input.
-
-            # Use last_download_dir if available and it matches the expected structure roughly?
-            # Or just check against the generated one for TODAY.
-            # LIMITATION: If day changed, "Downloaded" badge might disappear for default "downloads" folder.
-            # This is acceptable for simple logic.
-            # Better: If st.session_state.last_download_dir exists, check there too?
-
-            check_dirs = []
-            if st.session_state.last_download_dir:
-                check_dirs.append(st.session_state.last_download_dir)
-
-            # Also check what WOULD be the dir if downloaded now (for immediate feedback before last_download_dir updates or if manual refind)
-            calc_dir = os.path.join(
-                get_default_output_dir(current_query), st.session_state.executed_source
-            )
-            if calc_dir not in check_dirs:
-                check_dirs.append(calc_dir)
-
-        else:
-            # User specified a specific directory
-            check_dirs = [
-                os.path.join(target_dir_base, st.session_state.executed_source)
-            ]
-
         if st.session_state.filter_keyword:
             kw = st.session_state.filter_keyword.lower()
             display_results = [
@@ -466,6 +427,17 @@ def results_list_view(go_to_export_callback):
                 and p.published_date.year <= st.session_state.filter_year_max
             ]
 
+        # Positions in st.session_state.results: selection is stored by these, so it
+        # stays valid across filters and pages
+        shown = {id(p) for p in display_results}
+        display_indices = [i for i, p in enumerate(results) if id(p) in shown]
+
+        # Pagination: only the current page is rendered on each rerun
+        page_size = st.session_state.results_page_size
+        page_count = max(1, -(-len(display_indices) // page_size))
+        page = min(st.session_state.results_page, page_count - 1)
+        page_indices = display_indices[page * page_size : (page + 1) * page_size]
+
         # List Control Header
         col_ctrl_1, col_ctrl_2, col_ctrl_3 = st.columns(
             [1, 1, 8], vertical_alignment="center"
@@ -473,16 +445,13 @@ def results_list_view(go_to_export_callback):
         with col_ctrl_1:
 
             def toggle_select_all():
-                is_checked = st.session_state.select_all_checkbox
-                if is_checked:
-                    indices = set(range(len(display_results)))
-                    st.session_state.selected_papers = indices
-                    for i in range(len(display_results)):
-                        st.session_state[f"chk_{i}"] = True
+                # Applies to every filtered result, not only the visible page
+                if st.session_state.select_all_checkbox:
+                    st.session_state.selected_papers |= set(display_indices)
                 else:
-                    st.session_state.selected_papers = set()
-                    for i in range(len(display_results)):
-                        st.session_state[f"chk_{i}"] = False
+                    st.session_state.selected_papers -= set(display_indices)
+                for i in page_indices:
+                    st.session_state[f"chk_{i}"] = i in st.session_state.selected_papers
 
             st.checkbox(
                 "Select All", key="select_all_checkbox", on_change=toggle_select_all
@@ -493,8 +462,63 @@ def results_list_view(go_to_export_callback):
         with col_ctrl_3:
             st.caption("Results for: " + st.session_state.executed_query)
 
+        def page_controls(position):
+            if page_count <= 1:
+                return
+
+            def go_to(target):
+                st.session_state.results_page = target
+
+            col_prev, col_info, col_next, col_size = st.columns(
+                [1, 2, 1, 2], vertical_alignment="center"
+            )
+            with col_prev:
+                st.button(
+                    "◀ Prev",
+                    key=f"page_prev_{position}",
+                    disabled=page == 0,
+                    on_click=go_to,
+                    args=(page - 1,),
+                    use_container_width=True,
+                )
+            with col_info:
+                first = page * page_size + 1
+                last = page * page_size + len(page_indices)
+                st.caption(
+                    f"Page {page + 1}/{page_count} ({first}-{last} of {len(display_indices)})"
+                )
+            with col_next:
+                st.button(
+                    "Next ▶",
+                    key=f"page_next_{position}",
+                    disabled=page >= page_count - 1,
+                    on_click=go_to,
+                    args=(page + 1,),
+                    use_container_width=True,
+                )
+            if position == "top":
+                with col_size:
+                    st.selectbox(
+                        "Per page",
+                        sorted(set(PAGE_SIZE_OPTIONS) | {page_size}),
+                        key="results_page_size",
+                        on_change=go_to,
+                        args=(0,),
+                        label_visibility="collapsed",
+                        format_func=lambda n: f"{n} / page",
+                    )
+
+        page_controls("top")
+
+        # Downloaded-file index: one query for the visible page, no filesystem access
+        library = get_library()
+        downloaded = (
+            library.lookup_papers(results[i] for i in page_indices) if library else {}
+        )
+
         # Render List
-        for i, paper in enumerate(display_results):
+        for i in page_indices:
+            paper = results[i]
             with st.container():
                 col_c1, col_c2 = st.columns([0.5, 10])
                 with col_c1:
@@ -528,16 +552,8 @@ def results_list_view(go_to_export_callback):
 
                         badges += ' <span class="badge badge-locked">Restricted</span>'
 
-                    # Check if downloaded
-                    is_downloaded = False
-                    expected_filename = generate_filename(
-                        paper.title, paper.authors, paper.published_date, paper.source
-                    )
-
-                    for d in check_dirs:
-                        if os.path.exists(os.path.join(d, expected_filename)):
-                            is_downloaded = True
-                            break
+                    # Check if downloaded (looked up once for the whole page)
+                    is_downloaded = (paper.source, paper.id) in downloaded
 
                     if is_downloaded:
                         badges += ' <span class="badge badge-source" style="background-color: #28a745;">✅ Downloaded</span>'
@@ -559,5 +575,7 @@ def results_list_view(go_to_export_callback):
                         st.write(paper.abstract)
                         st.caption(f"PDF URL: {paper.pdf_url}")
 
+        page_controls("bottom")
+
     else:
         st.info("No results found.")
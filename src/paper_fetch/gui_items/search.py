@@ -11,6 +11,7 @@ from paper_fetch.gui_items.operater import (
     search_papers,
     get_default_output_dir,
 )
+from paper_fetch.library import get_library
 from paper_fetch.utils import save_papers_to_json
 from paper_fetch.gui_items.state import save_state
 import datetime
@@ -80,13 +81,22 @@ def perform_search():
         if not os.path.exists(save_dir):
             os.makedirs(save_dir)
 
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"search_results_{timestamp}.json"
-        save_path = os.path.join(save_dir, filename)
-
+        library = get_library()
         try:
-            save_papers_to_json(st.session_state.results, save_path)
-            st.success(f"Saved results to {save_path}")
+            if library is not None:
+                library.record_search(
+                    current_source,
+                    st.session_state.query,
+                    st.session_state.results,
+                    save_dir,
+                )
+                st.success("Saved results to the session history")
+            else:
+                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                filename = f"search_results_{timestamp}.json"
+                save_path = os.path.join(save_dir, filename)
+                save_papers_to_json(st.session_state.results, save_path)
+                st.success(f"Saved results to {save_path}")
         except Exception as e:
             st.error(f"Failed to save results: {e}")
 
@@ -174,10 +184,10 @@ def search_panel():
 
         with col_save_json:
             st.checkbox(
-                "Save Results to JSON",
+                "Save to Session History",
                 value=st.session_state.save_json,
                 key="widget_save_json",
-                help="Automatically save search results to a JSON file after searching.",
+                help="Record search results in the local catalog so they can be resumed from the Session Manager.",
                 on_change=sync_widget,
                 kwargs={"key": "save_json"},
             )
@@ -3,7 +3,13 @@ import os
 import json
 import datetime
 from paper_fetch.fetchers.models import Paper
+from paper_fetch.gui_items.operater import get_default_output_dir
 from paper_fetch.gui_items.state import save_state
+from paper_fetch.library import get_library
+from paper_fetch.utils import load_papers_from_json
+
+# Number of most recent sessions listed
+SESSION_LIMIT = 200
 
 
 def session_manager_panel():
@@ -19,10 +25,131 @@ def session_manager_panel():
 
     st.markdown("---")
     st.subheader("Saved Sessions")
+
+    library = get_library()
+    if library is None:
+        st.caption(
+            "Select a past session to resume work. Sessions are identified by `search_results.json` files in your downloads directory."
+        )
+        json_sessions_panel()
+        return
+
     st.caption(
-        "Select a past session to resume work. Sessions are identified by `search_results.json` files in your downloads directory."
+        "Select a past session to resume work. Searches are recorded in the local catalog when 'Save to Session History' is enabled."
     )
 
+    with st.expander("Import JSON sessions"):
+        st.caption(
+            "Add `search_results_*.json` files from the downloads directory to the session history."
+        )
+        if st.button("📥 Import", key="import_json_sessions"):
+            imported = import_json_sessions(library)
+            st.success(f"Imported {imported} sessions.")
+
+    sessions = library.list_searches(limit=SESSION_LIMIT)
+    if not sessions:
+        st.info("No saved sessions found.")
+        return
+
+    # Display sessions (newest first)
+    for sess in sessions:
+        with st.container():
+            col1, col2, col3, col4, col5, col6 = st.columns([2, 3, 1, 1.5, 1.5, 0.5])
+            with col1:
+                created = datetime.datetime.fromtimestamp(sess.created_at)
+                st.write(f"**{created.strftime('%Y-%m-%d %H:%M')}**")
+            with col2:
+                st.write(f"`{sess.query}`")
+            with col3:
+                st.write(f"{sess.source.upper()}")
+            with col4:
+                st.write(f"{sess.paper_count} papers ({sess.downloaded_count} ✅)")
+            with col5:
+                if st.button(
+                    "📂 Load", key=f"load_search_{sess.id}", use_container_width=True
+                ):
+                    load_search(library, sess)
+            with col6:
+                if st.button("🗑️", key=f"delete_search_{sess.id}", help="Delete"):
+                    library.delete_search(sess.id)
+                    st.rerun()
+
+
+def _find_json_sessions(root_dir: str = "downloads"):
+    """Yield (path, directory, filename) of search_results_*.json files."""
+    # Valid structure usually: downloads/YYYYMMDD_query/search_results_*.json
+    for dirpath, dirnames, filenames in os.walk(root_dir):
+        for f in filenames:
+            if f.startswith("search_results_") and f.endswith(".json"):
+                yield os.path.join(dirpath, f), dirpath, f
+
+
+def _query_from_folder(folder: str) -> str:
+    # Try to infer query from directory name: YYYYMMDD_query
+    # 20241218_some_query -> some_query
+    parts = folder.split("_", 1)
+    if len(parts) > 1:
+        return parts[1]
+    return folder
+
+
+def import_json_sessions(library, root_dir: str = "downloads") -> int:
+    """Record JSON sessions in the catalog. Files imported before are skipped."""
+    imported = 0
+    for path, dirpath, _ in _find_json_sessions(root_dir):
+        created_at = os.stat(path).st_mtime
+        if library.find_search(dirpath, created_at) is not None:
+            continue
+        try:
+            papers = load_papers_from_json(path)
+        except Exception:
+            continue  # Skip unreadable files
+
+        library.record_search(
+            papers[0].source if papers else "unknown",
+            _query_from_folder(os.path.basename(os.path.normpath(dirpath))),
+            papers,
+            dirpath,
+            created_at=created_at,
+        )
+        imported += 1
+    return imported
+
+
+def _open_results(papers, target_dir, source, query):
+    """Put the loaded results in the session and switch to the results view."""
+    st.session_state.results = papers
+    st.session_state.executed_save_dir = target_dir
+    st.session_state.output_dir = target_dir
+    st.session_state.executed_source = source
+    st.session_state.executed_query = query
+    st.session_state.query = query
+
+    # Reset selection
+    st.session_state.selected_papers = set()
+
+    # Switch Mode
+    st.session_state.in_session_manager_mode = False
+    st.session_state.in_search_phase = False
+
+    save_state()
+
+
+def load_search(library, search):
+    """Load a session stored in the catalog and switch context."""
+    try:
+        papers = library.load_search(search.id)
+        target_dir = search.save_dir or get_default_output_dir(search.query)
+        _open_results(papers, target_dir, search.source, search.query)
+        st.success(f"Loaded session from {target_dir}")
+        st.rerun()
+
+    except Exception as e:
+        st.error(f"Failed to load session: {e}")
+
+
+def json_sessions_panel():
+    """Session list built from the JSON files (used when [library] is disabled)."""
     root_dir = "downloads"
     if not os.path.exists(root_dir):
         st.info("No 'downloads' directory found.")
@@ -31,37 +158,32 @@ def session_manager_panel():
     # Scan for JSON files
     sessions = []
 
-    # Walk depth=2 (root -> query_folder -> json?)
-    # Valid structure usually: downloads/YYYYMMDD_query/search_results_*.json
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        for f in filenames:
-            if f.startswith("search_results_") and f.endswith(".json"):
-                full_path = os.path.join(dirpath, f)
-                try:
-                    stats = os.stat(full_path)
-                    mod_time = datetime.datetime.fromtimestamp(stats.st_mtime)
-
-                    # Try to read info for preview
-                    with open(full_path, "r", encoding="utf-8") as json_file:
-                        data = json.load(json_file)
-                        count = len(data)
-                        first_paper_source = (
-                            data[0].get("source", "Unknown") if count > 0 else "Unknown"
-                        )
-
-                    sessions.append(
-                        {
-                            "path": full_path,
-                            "dir": dirpath,
-                            "filename": f,
-                            "time": mod_time,
-                            "count": count,
-                            "source": first_paper_source,
-                            "parent_folder": os.path.basename(dirpath),
-                        }
-                    )
-                except Exception:
-                    pass  # Skip unreadable files
+    for full_path, dirpath, f in _find_json_sessions(root_dir):
+        try:
+            stats = os.stat(full_path)
+            mod_time = datetime.datetime.fromtimestamp(stats.st_mtime)
+
+            # Try to read info for preview
+            with open(full_path, "r", encoding="utf-8") as json_file:
+                data = json.load(json_file)
+                count = len(data)
+                first_paper_source = (
+                    data[0].get("source", "Unknown") if count > 0 else "Unknown"
+                )
+
+            sessions.append(
+                {
+                    "path": full_path,
+                    "dir": dirpath,
+                    "filename": f,
+                    "time": mod_time,
+                    "count": count,
+                    "source": first_paper_source,
+                    "parent_folder": os.path.basename(dirpath),
+                }
+            )
+        except Exception:
+            pass  # Skip unreadable files
 
     if not sessions:
         st.info("No saved sessions found.")
@@ -100,10 +222,7 @@ def load_session(session_info):
         # Reconstruct Paper objects
         papers = []
         for p_data in data:
-            # Handle date string locally if needed, but Paper model expects date object maybe?
-            # The Paper model likely needs to handle string -> date conversion or we do it here.
-            # Let's check Paper model. Paper model has Optional[date].
-            # We need to parse ISO format string back to date object.
+            # Paper.published_date is Optional[date]; parse the ISO format string back
             p_date = None
             if p_data.get("published_date"):
                 try:
@@ -124,31 +243,12 @@ def load_session(session_info):
             )
             papers.append(paper)
 
-        # Update Session State
-        st.session_state.results = papers
-        st.session_state.executed_save_dir = target_dir
-        st.session_state.output_dir = target_dir
-        st.session_state.executed_source = session_info["source"]
-
-        # Try to infer query from directory name: YYYYMMDD_query
-        # 20241218_some_query -> some_query
-        parts = session_info["parent_folder"].split("_", 1)
-        if len(parts) > 1:
-            inferred_query = parts[1]
-        else:
-            inferred_query = session_info["parent_folder"]
-
-        st.session_state.executed_query = inferred_query
-        st.session_state.query = inferred_query
-
-        # Reset selection
-        st.session_state.selected_papers = set()
-
-        # Switch Mode
-        st.session_state.in_session_manager_mode = False
-        st.session_state.in_search_phase = False
-
-        save_state()
+        _open_results(
+            papers,
+            target_dir,
+            session_info["source"],
+            _query_from_folder(session_info["parent_folder"]),
+        )
         st.success(f"Loaded session from {target_dir}")
         st.rerun()
 
@@ -9,6 +9,7 @@ def init_session_state():
     config = load_config()
     core_config = config.get("core", {})
     tgpp_config = config.get("3gpp", {})
+    gui_config = config.get("gui", {})
 
     if "results" not in st.session_state:
         st.session_state.results = []
@@ -91,6 +92,16 @@ def init_session_state():
         st.session_state.in_session_manager_mode = False
     if "notebook_id_env" not in st.session_state:
         st.session_state.notebook_id_env = ""
+    if "results_page" not in st.session_state:
+        st.session_state.results_page = 0
+    if "results_page_size" not in st.session_state:
+        st.session_state.results_page_size = max(
+            1, int(gui_config.get("page_size", 50))
+        )
+    if "download_job_id" not in st.session_state:
+        st.session_state.download_job_id = (
+            None  # Background download job (not persisted)
+        )
 
     # Try to load previous state if this is a fresh run (indicated by empty results/query on startup)
     # However, Streamlit reruns the whole script on interaction, so we need a flag to know if we already loaded.
@@ -0,0 +1,187 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .downloader import DownloadEngine, DownloadTask
+from .fetchers.models import Paper
+
+
+@dataclass
+class JobItem:
+    paper: Paper
+    status: str = "queued"  # queued -> waiting -> downloading -> done / failed
+    path: Optional[str] = None
+    error: Optional[str] = None
+    received: int = 0
+    total: Optional[int] = None
+    started_at: Optional[float] = None
+    transfer_started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def eta(self) -> Optional[float]:
+        """Seconds until this transfer completes, from its byte rate so far."""
+        if self.status != "downloading" or not self.total or not self.received:
+            return None
+        elapsed = time.time() - self.transfer_started_at
+        if elapsed <= 0:
+            return None
+        return max(0.0, (self.total - self.received) * elapsed / self.received)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.paper.id,
+            "title": self.paper.title,
+            "source": self.paper.source,
+            "status": self.status,
+            "bytes": self.received,
+            "total_bytes": self.total,
+            "eta": self.eta(),
+            "path": self.path,
+            "error": self.error,
+        }
+
+
+@dataclass
+class Job:
+    id: str
+    items: List[JobItem]
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    cancelled: bool = False
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def status(self) -> str:
+        if self.done:
+            return "cancelled" if self.cancelled else "finished"
+        if any(item.status != "queued" for item in self.items):
+            return "running"
+        return "queued"
+
+    def eta(self) -> Optional[float]:
+        """
+        Seconds until the whole batch completes: remaining items are estimated
+        from the average time (including politeness waits) of finished ones.
+        """
+        if self.done:
+            return 0.0
+        finished = [i for i in self.items if i.finished_at and i.started_at]
+        if not finished:
+            return None
+        average = sum(i.finished_at - i.started_at for i in finished) / len(finished)
+        pending = sum(1 for i in self.items if i.status in ("queued", "waiting"))
+        running = [i.eta() or 0.0 for i in self.items if i.status == "downloading"]
+        return pending * average + max(running, default=0.0)
+
+    def to_dict(self, with_items: bool = True) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for item in self.items:
+            counts[item.status] = counts.get(item.status, 0) + 1
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "total": len(self.items),
+            "counts": counts,
+            "bytes": sum(item.received for item in self.items),
+            "eta": self.eta(),
+            "elapsed": (self.finished_at or time.time()) - self.created_at,
+        }
+        if with_items:
+            data["items"] = [item.to_dict() for item in self.items]
+        return data
+
+
+class JobManager:
+    """
+    Runs download batches in background threads and keeps their progress.
+    Each job uses its own DownloadEngine, so per-host lanes and the shared
+    rate limiters apply exactly as for foreground downloads. Only the last
+    `max_jobs` jobs are kept.
+
+    Jobs live in memory only: they survive GUI reruns and MCP tool calls, but
+    a restart of the process stops running jobs and forgets their status and
+    results. Files already saved stay on disk and in the download index.
+    """
+
+    def __init__(self, jobs: Optional[int] = None, max_jobs: int = 50):
+        self.jobs = jobs
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, tasks: List[DownloadTask]) -> str:
+        """Start a batch in the background and return its job ID."""
+        job = Job(id=uuid.uuid4().hex[:12], items=[JobItem(t.paper) for t in tasks])
+        for task, item in zip(tasks, job.items):
+            task.on_progress = self._progress_hook(item)
+
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_jobs:
+                oldest = next(iter(self._jobs.values()))
+                if not oldest.done:
+                    break
+                self._jobs.popitem(last=False)
+
+        thread = threading.Thread(
+            target=self._run, args=(job, tasks), name=f"job-{job.id}", daemon=True
+        )
+        thread.start()
+        return job.id
+
+    def _progress_hook(self, item: JobItem):
+        def on_progress(received: Optional[int], total: Optional[int]):
+            now = time.time()
+            if received is None:
+                item.status = "waiting"
+                item.started_at = now
+                return
+            if item.status != "downloading":
+                item.status = "downloading"
+                item.transfer_started_at = now
+            item.received = received
+            item.total = total
+
+        return on_progress
+
+    def _run(self, job: Job, tasks: List[DownloadTask]):
+        items = {id(task): item for task, item in zip(tasks, job.items)}
+        try:
+            for result in DownloadEngine(self.jobs).iter_run(tasks):
+                item = items[id(result.task)]
+                item.finished_at = time.time()
+                if result.ok:
+                    item.status = "done"
+                    item.path = result.path
+                else:
+                    item.status = "failed"
+                    item.error = str(result.error)
+                if job.cancelled:
+                    break
+        finally:
+            for item in job.items:
+                if item.status in ("queued", "waiting", "downloading"):
+                    item.status = "cancelled"
+            job.finished_at = time.time()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        """Stop a job after the downloads currently in progress finish."""
+        job = self.get(job_id)
+        if job is None or job.done:
+            return False
+        job.cancelled = True
+        return True
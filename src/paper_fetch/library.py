@@ -0,0 +1,343 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .fetchers.models import Paper
+
+# Bulk lookups are split into chunks to stay below SQLite's parameter limit
+_LOOKUP_CHUNK = 400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    source TEXT NOT NULL,
+    paper_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    downloaded_at REAL NOT NULL,
+    PRIMARY KEY (source, paper_id, path)
+);
+CREATE INDEX IF NOT EXISTS downloads_sha256 ON downloads (sha256);
+
+CREATE TABLE IF NOT EXISTS papers (
+    source TEXT NOT NULL,
+    id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    authors TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    url TEXT NOT NULL,
+    pdf_url TEXT NOT NULL,
+    published_date TEXT,
+    year INTEGER,
+    is_downloadable INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (source, id)
+);
+CREATE INDEX IF NOT EXISTS papers_id ON papers (id);
+CREATE INDEX IF NOT EXISTS papers_year ON papers (year);
+CREATE INDEX IF NOT EXISTS papers_title ON papers (title COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS searches (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    query TEXT NOT NULL,
+    save_dir TEXT,
+    paper_count INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS searches_created_at ON searches (created_at);
+CREATE INDEX IF NOT EXISTS searches_source ON searches (source, created_at);
+
+CREATE TABLE IF NOT EXISTS search_results (
+    search_id INTEGER NOT NULL REFERENCES searches (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    paper_id TEXT NOT NULL,
+    PRIMARY KEY (search_id, position)
+);
+CREATE INDEX IF NOT EXISTS search_results_paper ON search_results (source, paper_id);
+"""
+
+
+@dataclass
+class DownloadRecord:
+    source: str
+    paper_id: str
+    path: str
+    size: int
+    sha256: str
+    downloaded_at: float
+
+
+@dataclass
+class SearchRecord:
+    id: int
+    source: str
+    query: str
+    save_dir: Optional[str]
+    paper_count: int
+    created_at: float
+    downloaded_count: int = 0
+
+
+def _paper_row(paper: Paper, now: float) -> Tuple:
+    published = paper.published_date
+    if isinstance(published, str):
+        try:
+            published = date.fromisoformat(published[:10])
+        except ValueError:
+            published = None
+    return (
+        paper.source,
+        paper.id,
+        paper.title or "",
+        json.dumps(list(paper.authors or []), ensure_ascii=False),
+        paper.abstract or "",
+        paper.url or "",
+        paper.pdf_url or "",
+        published.isoformat() if published else None,
+        published.year if published else None,
+        int(bool(paper.is_downloadable)),
+        now,
+    )
+
+
+def _row_paper(row) -> Paper:
+    source, paper_id, title, authors, abstract, url, pdf_url, published = row[:8]
+    return Paper(
+        source=source,
+        id=paper_id,
+        title=title,
+        authors=json.loads(authors),
+        abstract=abstract,
+        url=url,
+        pdf_url=pdf_url,
+        published_date=date.fromisoformat(published) if published else None,
+        is_downloadable=bool(row[9]),
+    )
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Library:
+    """
+    Local SQLite catalog of papers, searches and downloaded files, keyed by
+    (source, paper id).
+
+    Every fetcher's download_pdf records what it saved (path, size, SHA-256 and
+    time), so "already downloaded" checks are a single indexed query instead of
+    regenerating filenames and stat-ing candidate directories. A paper can have
+    several artifacts (e.g. a 3GPP archive converted to PDF).
+
+    Searches are stored as ordered lists of paper keys; paper metadata is kept
+    once per (source, id) and refreshed whenever a search returns it again.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        # Shared by worker threads; access is serialized by self._lock
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+    def record_download(self, paper: Paper, path: str) -> Optional[DownloadRecord]:
+        """Add (or refresh) the entry for a saved file. Missing files are ignored."""
+        if not path or not os.path.isfile(path):
+            return None
+
+        record = DownloadRecord(
+            source=paper.source,
+            paper_id=paper.id,
+            path=os.path.abspath(path),
+            size=os.path.getsize(path),
+            sha256=_sha256(path),
+            downloaded_at=time.time(),
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO downloads VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    record.source,
+                    record.paper_id,
+                    record.path,
+                    record.size,
+                    record.sha256,
+                    record.downloaded_at,
+                ),
+            )
+        return record
+
+    def lookup(
+        self, keys: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], List[DownloadRecord]]:
+        """Return the recorded files for each (source, paper id), newest first."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[Tuple[str, str], List[DownloadRecord]] = {}
+
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[start : start + _LOOKUP_CHUNK]
+                placeholders = ", ".join(["(?, ?)"] * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT * FROM downloads WHERE (source, paper_id) IN "
+                    f"(VALUES {placeholders}) ORDER BY downloaded_at DESC",
+                    [value for key in chunk for value in key],
+                ).fetchall()
+                for row in rows:
+                    record = DownloadRecord(*row)
+                    found.setdefault((record.source, record.paper_id), []).append(
+                        record
+                    )
+        return found
+
+    def lookup_papers(self, papers: Iterable[Paper]) -> Dict[Tuple[str, str], List]:
+        """Bulk lookup for search results (see `lookup`)."""
+        return self.lookup((paper.source, paper.id) for paper in papers)
+
+    def forget(self, source: str, paper_id: str, path: Optional[str] = None):
+        """Remove the entries of a paper (or just one of its files)."""
+        query = "DELETE FROM downloads WHERE source = ? AND paper_id = ?"
+        params: List[Any] = [source, paper_id]
+        if path is not None:
+            query += " AND path = ?"
+            params.append(os.path.abspath(path))
+        with self._lock, self._conn:
+            self._conn.execute(query, params)
+
+    def prune_missing(self) -> int:
+        """Drop entries whose file no longer exists; returns how many were removed."""
+        with self._lock:
+            paths = [row[0] for row in self._conn.execute("SELECT path FROM downloads")]
+        missing = [(p,) for p in paths if not os.path.exists(p)]
+        if missing:
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM downloads WHERE path = ?", missing)
+        return len(missing)
+
+    def record_search(
+        self,
+        source: str,
+        query: str,
+        papers: List[Paper],
+        save_dir: Optional[str] = None,
+        created_at: Optional[float] = None,
+    ) -> int:
+        """Store a search and its results (in order); returns the search ID."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO papers VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (_paper_row(paper, now) for paper in papers),
+            )
+            search_id = self._conn.execute(
+                "INSERT INTO searches (source, query, save_dir, paper_count, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    source,
+                    query,
+                    os.path.abspath(save_dir) if save_dir else None,
+                    len(papers),
+                    created_at or now,
+                ),
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO search_results VALUES (?, ?, ?, ?)",
+                (
+                    (search_id, position, paper.source, paper.id)
+                    for position, paper in enumerate(papers)
+                ),
+            )
+        return search_id
+
+    def list_searches(
+        self, limit: Optional[int] = 100, source: Optional[str] = None
+    ) -> List[SearchRecord]:
+        """Recent searches, newest first, with how many of their papers are downloaded."""
+        query = (
+            "SELECT s.id, s.source, s.query, s.save_dir, s.paper_count, s.created_at,"
+            " (SELECT COUNT(DISTINCT r.position) FROM search_results r"
+            "  JOIN downloads d ON d.source = r.source AND d.paper_id = r.paper_id"
+            "  WHERE r.search_id = s.id)"
+            " FROM searches s"
+        )
+        params: List[Any] = []
+        if source is not None:
+            query += " WHERE s.source = ?"
+            params.append(source)
+        query += " ORDER BY s.created_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [SearchRecord(*row) for row in rows]
+
+    def get_search(self, search_id: int) -> Optional[SearchRecord]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM searches WHERE id = ?", (search_id,)
+            ).fetchone()
+        return SearchRecord(*row) if row else None
+
+    def find_search(self, save_dir: str, created_at: float) -> Optional[int]:
+        """ID of the search saved to `save_dir` at `created_at`, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM searches WHERE created_at = ? AND save_dir = ?",
+                (created_at, os.path.abspath(save_dir)),
+            ).fetchone()
+        return row[0] if row else None
+
+    def load_search(self, search_id: int) -> List[Paper]:
+        """Return the papers of a stored search in their original order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT p.* FROM search_results r"
+                " JOIN papers p ON p.source = r.source AND p.id = r.paper_id"
+                " WHERE r.search_id = ? ORDER BY r.position",
+                (search_id,),
+            ).fetchall()
+        return [_row_paper(row) for row in rows]
+
+    def delete_search(self, search_id: int):
+        """Remove a stored search. Paper metadata and download records are kept."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM searches WHERE id = ?", (search_id,))
+
+
+_library: Optional[Library] = None
+_lock = threading.Lock()
+
+
+def get_library(library_cfg: Optional[Mapping[str, Any]] = None) -> Optional[Library]:
+    """Return the process-wide library, or None if disabled in [library]."""
+    global _library
+    if library_cfg is None:
+        from .config import load_config
+
+        library_cfg = load_config().get("library", {})
+    if not library_cfg.get("enabled", True):
+        return None
+
+    with _lock:
+        if _library is None:
+            _library = Library(
+                library_cfg.get("path", "~/.local/share/paper-fetch/library.db")
+            )
+        return _library
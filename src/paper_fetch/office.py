@@ -0,0 +1,296 @@
+import atexit
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# PDF export filter per document type (checked in this order)
+_PDF_FILTERS = [
+    ("com.sun.star.text.GenericTextDocument", "writer_pdf_Export"),
+    ("com.sun.star.sheet.SpreadsheetDocument", "calc_pdf_Export"),
+    ("com.sun.star.presentation.PresentationDocument", "impress_pdf_Export"),
+    ("com.sun.star.drawing.DrawingDocument", "draw_pdf_Export"),
+]
+
+
+class OfficeError(Exception):
+    """A document could not be converted by the office server."""
+
+
+class OfficeUnavailable(OfficeError):
+    """LibreOffice could not be started or connected to over UNO."""
+
+
+def uno_available() -> bool:
+    """Whether the LibreOffice Python bridge (`uno`) can be imported."""
+    try:
+        import uno  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def worker_count(converter_cfg: Mapping[str, Any]) -> int:
+    """`[converter] workers`, where 0 means one per CPU core."""
+    workers = int(converter_cfg.get("workers", 0) or 0)
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+class OfficeWorker:
+    """
+    One headless LibreOffice process with its own user profile, driven over
+    UNO through a named pipe. The process is started on first use and kept
+    warm, so a conversion only costs loading and exporting the document.
+    A crashed or killed process is started again on the next conversion.
+    """
+
+    def __init__(self, soffice: str, start_timeout: float = 60.0):
+        self.soffice = soffice
+        self.start_timeout = start_timeout
+        self.pipe_name = f"paperfetch_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self.profile_dir = tempfile.mkdtemp(prefix="paper-fetch-office-")
+        self._process: Optional[subprocess.Popen] = None
+        self._desktop: Any = None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        import uno
+        from com.sun.star.connection import NoConnectException
+
+        self.stop()
+        self._process = subprocess.Popen(
+            [
+                self.soffice,
+                f"-env:UserInstallation=file://{self.profile_dir}",
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--norestore",
+                "--nodefault",
+                f"--accept=pipe,name={self.pipe_name};urp;StarOffice.ComponentContext",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        local_ctx = uno.getComponentContext()
+        resolver = local_ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_ctx
+        )
+        deadline = time.monotonic() + self.start_timeout
+        while True:
+            if self._process.poll() is not None:
+                raise OfficeUnavailable(
+                    f"soffice exited during startup ({self._process.returncode})"
+                )
+            try:
+                ctx = resolver.resolve(
+                    f"uno:pipe,name={self.pipe_name};urp;StarOffice.ComponentContext"
+                )
+                break
+            except NoConnectException:
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise OfficeUnavailable("Timed out connecting to soffice")
+                time.sleep(0.2)
+
+        self._desktop = ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", ctx
+        )
+
+    def convert(self, input_path: str, output_path: str) -> str:
+        """Export `input_path` as PDF to `output_path`."""
+        import uno
+        from com.sun.star.beans import PropertyValue
+
+        def props(**values):
+            return tuple(PropertyValue(Name=k, Value=v) for k, v in values.items())
+
+        if not self.alive:
+            self.start()
+
+        doc = self._desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(os.path.abspath(input_path)),
+            "_blank",
+            0,
+            props(Hidden=True, ReadOnly=True),
+        )
+        if doc is None:
+            raise OfficeError(f"LibreOffice could not open {input_path}")
+        try:
+            pdf_filter = next(
+                (f for service, f in _PDF_FILTERS if doc.supportsService(service)),
+                "writer_pdf_Export",
+            )
+            doc.storeToURL(
+                uno.systemPathToFileUrl(os.path.abspath(output_path)),
+                props(FilterName=pdf_filter),
+            )
+        finally:
+            doc.close(True)
+        return output_path
+
+    def kill(self):
+        """Kill the process (unblocks a conversion that is stuck)."""
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+
+    def stop(self):
+        if self._desktop is not None and self.alive:
+            try:
+                self._desktop.terminate()
+            except Exception:
+                pass
+        self._desktop = None
+        if self._process is not None:
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+            self._process = None
+
+    def close(self):
+        self.stop()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class OfficeServer:
+    """
+    Queue of PDF conversions served by warm LibreOffice workers.
+
+    Requests are handled in order by `workers` threads, each owning one
+    OfficeWorker. A conversion that exceeds `timeout` seconds gets its
+    soffice process killed; the worker is restarted for the next request,
+    as it is after a crash.
+    """
+
+    def __init__(self, soffice: str, workers: int = 1, timeout: float = 60.0):
+        self.soffice = soffice
+        self.timeout = timeout
+        self._queue: "queue.Queue" = queue.Queue()
+        self._workers: List[OfficeWorker] = []
+        self._threads: List[threading.Thread] = []
+        for n in range(max(1, workers)):
+            worker = self._make_worker()
+            thread = threading.Thread(
+                target=self._serve, args=(worker,), name=f"office-{n}", daemon=True
+            )
+            self._workers.append(worker)
+            self._threads.append(thread)
+            thread.start()
+
+    def _make_worker(self) -> OfficeWorker:
+        return OfficeWorker(self.soffice)
+
+    def submit(self, input_path: str, output_path: str) -> Future:
+        """Queue a conversion; the future resolves to `output_path`."""
+        future: Future = Future()
+        self._queue.put((input_path, output_path, future))
+        return future
+
+    def convert(self, input_path: str, output_path: str) -> str:
+        return self.submit(input_path, output_path).result()
+
+    def _serve(self, worker: OfficeWorker):
+        while True:
+            request = self._queue.get()
+            if request is None:
+                break
+            input_path, output_path, future = request
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                # Startup is not counted against the per-document timeout
+                if not worker.alive:
+                    worker.start()
+            except Exception as e:
+                future.set_exception(
+                    e if isinstance(e, OfficeUnavailable) else OfficeUnavailable(e)
+                )
+                continue
+
+            timed_out = threading.Event()
+
+            def expire():
+                timed_out.set()
+                worker.kill()
+
+            timer = threading.Timer(self.timeout, expire)
+            timer.start()
+            try:
+                future.set_result(worker.convert(input_path, output_path))
+            except Exception as e:
+                if timed_out.is_set():
+                    message = f"Conversion timed out after {self.timeout}s"
+                elif not worker.alive:
+                    message = "soffice crashed during conversion"
+                else:
+                    message = f"Conversion failed: {e}"
+                future.set_exception(OfficeError(f"{message} ({input_path})"))
+            finally:
+                timer.cancel()
+
+    def close(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout=10)
+        for worker in self._workers:
+            worker.close()
+
+
+_server: Optional[OfficeServer] = None
+_disabled = False
+_lock = threading.Lock()
+
+
+def get_office_server(
+    soffice: str, converter_cfg: Optional[Mapping[str, Any]] = None
+) -> Optional[OfficeServer]:
+    """
+    Return the process-wide office server, or None if it is disabled in
+    [converter] or the `uno` module is not installed.
+    """
+    global _server
+    if _disabled:
+        return None
+    if converter_cfg is None:
+        from .config import load_config
+
+        converter_cfg = load_config().get("converter", {})
+    if not converter_cfg.get("office_server", True) or not uno_available():
+        return None
+
+    with _lock:
+        if _server is None:
+            _server = OfficeServer(
+                soffice,
+                workers=worker_count(converter_cfg),
+                timeout=converter_cfg.get("timeout", 60),
+            )
+            atexit.register(_server.close)
+        return _server
+
+
+def disable_office_server():
+    """Stop the office server and use per-file soffice for the rest of the process."""
+    global _server, _disabled
+    with _lock:
+        _disabled = True
+        server, _server = _server, None
+    if server is not None:
+        server.close()
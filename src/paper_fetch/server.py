@@ -1,25 +1,57 @@
 from mcp.server.fastmcp import FastMCP
-from typing import List, Optional
-from .fetchers.arxiv import ArxivFetcher
-from .fetchers.ieee import IeeeFetcher
-from .fetchers.threegpp import ThreeGPPFetcher
-from .fetchers.uspto import UsptoFetcher
+from typing import Dict, List, Optional, Tuple
+from .config import load_config
+from .downloader import DownloadTask
+from .jobs import JobManager
+from .fetchers.aio import AsyncFetcher
 from .fetchers.models import Paper
-from .exporters.notebooklm import upload_to_notebooklm
+from .sources import available_sources, get_fetcher
 from datetime import date
+import asyncio
 import re
 
 mcp = FastMCP("paper-fetch")
 
-# Initialize clients
-arxiv_client = ArxivFetcher()
-ieee_client = IeeeFetcher()
-threegpp_client = ThreeGPPFetcher()
-uspto_client = UsptoFetcher()
+# Async facades over the shared fetchers, built on first use of each source
+# (rate-limit waits never block the event loop)
+_clients: Dict[str, AsyncFetcher] = {}
+
+
+def _client(source: str) -> AsyncFetcher:
+    if source not in _clients:
+        _clients[source] = AsyncFetcher(get_fetcher(source))
+    return _clients[source]
+
+
+mcp_config = load_config().get("mcp", {})
+
+# Background batch downloads (download_papers_batch / job_status / job_result)
+job_manager = JobManager()
+
+# Per-source, per-kind ("search"/"download") caps on concurrently running tool calls
+_semaphores: Dict[Tuple[str, str], asyncio.Semaphore] = {}
+
+
+def _limit(source: str, kind: str) -> asyncio.Semaphore:
+    key = (source, kind)
+    if key not in _semaphores:
+        limit = mcp_config.get("source_concurrency", {}).get(
+            source, mcp_config.get("max_concurrency", 8)
+        )
+        _semaphores[key] = asyncio.Semaphore(max(1, int(limit)))
+    return _semaphores[key]
+
+
+def _lookup_downloads(papers: List[Paper]) -> Dict:
+    """Download index records of `papers` (empty if [library] is disabled)."""
+    from .library import get_library
+
+    library = get_library()
+    return library.lookup_papers(papers) if library else {}
 
 
 @mcp.tool()
-def search_papers(
+async def search_papers(
     source: str, query: str, limit: int = 5, open_access_only: bool = False
 ) -> str:
     """
@@ -32,76 +64,65 @@ def search_papers(
         open_access_only: If True, search only for Open Access papers (IEEE only)
     """
     s = source.lower()
-    if s == "arxiv":
-        client = arxiv_client
-    elif s == "ieee":
-        client = ieee_client
-    elif s == "3gpp":
-        client = threegpp_client
-    elif s == "uspto":
-        client = uspto_client
-    else:
+    if s not in available_sources():
         return f"Error: Unknown source '{source}'. Use 'arxiv', 'ieee', '3gpp', or 'uspto'."
 
     try:
+        client = _client(s)
         kwargs = {"max_results": limit}
         if s == "ieee":
             kwargs["open_access_only"] = open_access_only
 
-        results = client.search(query, **kwargs)
-
-        # Return a JSON string.
+        # Return a JSON string, serializing papers as they stream in.
         import json
 
-        return json.dumps(
-            [p.to_dict() for p in results], ensure_ascii=False, default=str
-        )
+        async with _limit(s, "search"):
+            papers = [p async for p in client.aiter_search(query, **kwargs)]
+
+        # Mark papers that were already downloaded (one indexed query, run off
+        # the event loop like the fetcher calls)
+        downloaded = await asyncio.to_thread(_lookup_downloads, papers)
+        results = []
+        for paper in papers:
+            data = paper.to_dict()
+            records = downloaded.get((paper.source, paper.id))
+            data["downloaded_path"] = records[0].path if records else None
+            results.append(data)
+        return json.dumps(results, ensure_ascii=False, default=str)
     except Exception as e:
         return f"Error searching {source}: {str(e)}"
 
 
-@mcp.tool()
-def download_paper(
-    url: str,
-    title: str,
-    authors: List[str],
-    year: Optional[int] = None,
-    save_dir: str = "downloads",
-) -> str:
+def _paper_from_url(
+    url: str, title: str, authors: List[str], year: Optional[int] = None
+) -> Optional[Tuple[AsyncFetcher, Paper]]:
     """
-    Download a paper's PDF given its metadata.
-    Automatically detects source from URL (Arxiv, IEEE, 3GPP, USPTO).
-
-    Args:
-        url: URL of the paper
-        title: Title of the paper (for filename)
-        authors: List of authors (for filename)
-        year: Publication year (for filename)
-        save_dir: Directory to save the PDF (default "downloads")
+    Build a Paper from download metadata, inferring the source from the URL.
+    Returns (client, paper), or None if the source can't be determined.
     """
     # Infer source from URL
     source = "unknown"
-    client = None
     pdf_url = url
     paper_id = "unknown"
 
     if "arxiv.org" in url:
         source = "arxiv"
-        client = arxiv_client
         pdf_url = url.replace("/abs/", "/pdf/")
         if not pdf_url.endswith(".pdf"):
             pdf_url += ".pdf"
+        # e.g. arxiv.org/abs/2401.01234v2 -> 2401.01234v2 (keys the download index)
+        match = re.search(r"/(?:abs|pdf)/(.+?)(?:\.pdf)?/?$", url)
+        if match:
+            paper_id = match.group(1)
 
     elif "ieeexplore.ieee.org" in url:
         source = "ieee"
-        client = ieee_client
         match = re.search(r"document/(\d+)", url)
         if match:
             paper_id = match.group(1)
 
     elif "3gpp.org" in url:
         source = "3gpp"
-        client = threegpp_client
         # 3GPP often provides direct file URLs, so paper_id is filename
         import os
 
@@ -109,7 +130,6 @@ def download_paper(
 
     elif "patents.google.com" in url or "uspto.gov" in url or "patentsview.org" in url:
         source = "uspto"
-        client = uspto_client
         # Attempt to extract ID (e.g., patent number) if possible, but optional as fetcher handles logic
         # For patents.google.com/patent/US12345/en -> US12345
         match = re.search(r"patent/([A-Za-z0-9]+)", url)
@@ -117,7 +137,7 @@ def download_paper(
             paper_id = match.group(1)
 
     else:
-        return f"Error: Could not determine source from URL '{url}'"
+        return None
 
     # Construct Paper object
     published_date = None
@@ -134,16 +154,119 @@ def download_paper(
         pdf_url=pdf_url,
         published_date=published_date,
     )
+    return _client(source), paper
+
+
+@mcp.tool()
+async def download_paper(
+    url: str,
+    title: str,
+    authors: List[str],
+    year: Optional[int] = None,
+    save_dir: str = "downloads",
+) -> str:
+    """
+    Download a paper's PDF given its metadata.
+    Automatically detects source from URL (Arxiv, IEEE, 3GPP, USPTO).
+
+    Args:
+        url: URL of the paper
+        title: Title of the paper (for filename)
+        authors: List of authors (for filename)
+        year: Publication year (for filename)
+        save_dir: Directory to save the PDF (default "downloads")
+    """
+    resolved = _paper_from_url(url, title, authors, year)
+    if resolved is None:
+        return f"Error: Could not determine source from URL '{url}'"
+    client, paper = resolved
 
     try:
-        path = client.download_pdf(paper, save_dir)
+        async with _limit(paper.source, "download"):
+            path = await client.download_pdf(paper, save_dir)
         return f"Successfully downloaded to: {path}"
     except Exception as e:
         return f"Error downloading paper: {str(e)}"
 
 
 @mcp.tool()
-def upload_to_notebooklm_tool(
+def download_papers_batch(papers: List[dict], save_dir: str = "downloads") -> str:
+    """
+    Start downloading several papers in the background and return a job ID at once.
+    Poll progress with `job_status` and collect file paths with `job_result`.
+
+    Args:
+        papers: List of {"url", "title", "authors", "year"} objects
+                (same fields as `download_paper`; "year" is optional)
+        save_dir: Directory to save the PDFs (default "downloads")
+    """
+    import json
+
+    tasks = []
+    for entry in papers:
+        url = entry.get("url", "")
+        resolved = _paper_from_url(
+            url, entry.get("title", ""), entry.get("authors", []), entry.get("year")
+        )
+        if resolved is None:
+            return f"Error: Could not determine source from URL '{url}'"
+        client, paper = resolved
+        tasks.append(DownloadTask(client.fetcher, paper, save_dir))
+
+    job_id = job_manager.submit(tasks)
+    return json.dumps({"job_id": job_id, "total": len(tasks)})
+
+
+@mcp.tool()
+def job_status(job_id: str) -> str:
+    """
+    Report the progress of a batch download job.
+    Includes overall counts, bytes transferred and ETA (seconds), plus per-item
+    status ("queued", "waiting", "downloading", "done", "failed", "cancelled").
+
+    Args:
+        job_id: ID returned by `download_papers_batch`
+    """
+    import json
+
+    job = job_manager.get(job_id)
+    if job is None:
+        return f"Error: Unknown job '{job_id}'"
+    return json.dumps(job.to_dict(), ensure_ascii=False)
+
+
+@mcp.tool()
+def job_result(job_id: str) -> str:
+    """
+    Return the downloaded file paths and errors of a batch download job.
+    While the job is still running, only the items finished so far are listed.
+
+    Args:
+        job_id: ID returned by `download_papers_batch`
+    """
+    import json
+
+    job = job_manager.get(job_id)
+    if job is None:
+        return f"Error: Unknown job '{job_id}'"
+
+    results = [
+        (
+            {"title": item.paper.title, "url": item.paper.url, "path": item.path}
+            if item.path
+            else {"title": item.paper.title, "url": item.paper.url, "error": item.error}
+        )
+        for item in job.items
+        if item.status in ("done", "failed")
+    ]
+    return json.dumps(
+        {"job_id": job.id, "status": job.status, "results": results},
+        ensure_ascii=False,
+    )
+
+
+@mcp.tool()
+async def upload_to_notebooklm_tool(
     upload_dir: str = "downloads",
     mode: str = "new",
     notebook_id: Optional[str] = None,
@@ -170,7 +293,11 @@ def upload_to_notebooklm_tool(
         # Note: The original function prints to stdout, which MCP captures?
         # FastMCP captures stdout/stderr, but for clarity we just call it.
 
-        upload_to_notebooklm(
+        from .exporters.notebooklm import upload_to_notebooklm
+
+        # Playwright's sync API can't run on the event loop thread
+        await asyncio.to_thread(
+            upload_to_notebooklm,
             output_dir=upload_dir,
             mode=mode,
             notebook_id=notebook_id,
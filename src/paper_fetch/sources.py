@@ -0,0 +1,67 @@
+import importlib
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Type
+
+if TYPE_CHECKING:
+    from .fetchers.base import BaseFetcher
+
+# Entry point group for fetcher plugins: `name = "package.module:FetcherClass"`
+ENTRY_POINT_GROUP = "paper_fetch.sources"
+
+# Source name -> "module:Class". Fetcher modules (and their dependencies such as
+# arxiv, requests or bs4) are only imported when the source is first used.
+# Built-in sources are listed here as well so they work without package metadata.
+SOURCES: Dict[str, str] = {
+    "arxiv": "paper_fetch.fetchers.arxiv:ArxivFetcher",
+    "ieee": "paper_fetch.fetchers.ieee:IeeeFetcher",
+    "3gpp": "paper_fetch.fetchers.threegpp:ThreeGPPFetcher",
+    "uspto": "paper_fetch.fetchers.uspto:UsptoFetcher",
+}
+
+_registry: Optional[Dict[str, str]] = None
+_instances: Dict[str, "BaseFetcher"] = {}
+_lock = threading.Lock()
+
+
+def _load_registry() -> Dict[str, str]:
+    """Built-in sources plus those registered by installed packages (read once)."""
+    global _registry
+    if _registry is None:
+        from importlib.metadata import entry_points
+
+        registry = dict(SOURCES)
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            registry.setdefault(entry_point.name.lower(), entry_point.value)
+        _registry = registry
+    return _registry
+
+
+def available_sources() -> List[str]:
+    return list(_load_registry())
+
+
+def get_fetcher_class(source: str) -> Type["BaseFetcher"]:
+    """Import and return the fetcher class registered for `source`."""
+    key = source.lower()
+    # Built-in sources resolve without scanning installed packages
+    target = SOURCES.get(key) or _load_registry().get(key)
+    if target is None:
+        raise ValueError(f"Unknown source: {source}")
+    module_name, _, class_name = target.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_fetcher(source: str) -> "BaseFetcher":
+    """Build a new fetcher instance for `source`."""
+    return get_fetcher_class(source)()
+
+
+def get_fetcher(source: str) -> "BaseFetcher":
+    """Return the process-wide fetcher for `source`, building it on first use."""
+    key = source.lower()
+    with _lock:
+        fetcher = _instances.get(key)
+        if fetcher is None:
+            fetcher = create_fetcher(key)
+            _instances[key] = fetcher
+        return fetcher